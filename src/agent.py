@@ -8,10 +8,10 @@ import asyncio
 import logging
 from datetime import date
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from functools import wraps
 
-from agent_framework import ChatAgent
+from agent_framework import ChatAgent, ai_function
 from agent_framework.openai import OpenAIChatClient
 from agent_framework.observability import setup_observability
 from openai import AsyncOpenAI, APIError, RateLimitError, APIConnectionError
@@ -24,6 +24,11 @@ from .memory import MemoryStore
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Wrap each tool once per process. ai_function reflects over the signature and
+# Annotated descriptions to build the JSON schema; ChatAgent would otherwise
+# redo that for every plain function each time an agent is (re)created.
+_AI_TOOLS = tuple(ai_function(tool) for tool in ALL_TOOLS)
+
 
 def setup_tracing(enable: bool = True, otlp_endpoint: str = "http://localhost:4317"):
     """
@@ -89,6 +94,25 @@ def retry_async(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
         return wrapper
     return decorator
 
+
+def create_shared_clients(enable_memory: bool = True) -> Tuple[AsyncOpenAI, OpenAIChatClient, Optional[MemoryStore]]:
+    """
+    Build the stateless, expensive parts of an agent: the OpenAI client
+    (and its HTTP pool), the default-model chat client and the memory store.
+    These can be shared between agents; conversation state cannot.
+    """
+    openai_client = AsyncOpenAI(
+        base_url=Config.MODEL_ENDPOINT,
+        api_key=Config.GITHUB_TOKEN
+    )
+    chat_client = OpenAIChatClient(
+        async_client=openai_client,
+        model_id=Config.MODEL_NAME
+    )
+    memory_store = MemoryStore(db_path="data/memory.db") if enable_memory else None
+    return openai_client, chat_client, memory_store
+
+
 class LifeAdminAgent:
     """
     The Life Admin Assistant agent.
@@ -101,7 +125,7 @@ class LifeAdminAgent:
     # Token management settings - More balanced approach
     MAX_CONVERSATION_TOKENS = 4000  # Increased for better context retention
     TOKENS_PER_CHAR = 0.4  # Slightly more accurate estimate
-    MAX_MESSAGES_BEFORE_SUMMARY = 8  # Less frequent summarization
+    MAX_MESSAGES_BEFORE_SUMMARY = Config.MAX_CONVERSATION_TURNS * 2  # Sliding window, in messages
     MAX_MESSAGE_LENGTH = 1500  # Allow longer messages
     SYSTEM_PROMPT_TOKENS = 600  # Condensed system prompt estimate
     
@@ -112,8 +136,14 @@ class LifeAdminAgent:
         "openai/gpt-4o-mini"
     ]
 
-    def __init__(self, enable_memory: bool = True):
-        """Initialize the agent with configuration."""
+    def __init__(self, enable_memory: bool = True,
+                 clients: Optional[Tuple[AsyncOpenAI, OpenAIChatClient, Optional[MemoryStore]]] = None):
+        """
+        Initialize the agent with configuration.
+
+        clients is an optional result of create_shared_clients() to reuse;
+        by default the agent builds its own.
+        """
         Config.validate()
 
         # Set up tracing (only once per application)
@@ -124,12 +154,13 @@ class LifeAdminAgent:
         # Initialize database
         self.repository = Repository(db_path=Config.DATABASE_PATH)
         
-        # Initialize persistent memory store
-        self.enable_memory = enable_memory
-        if enable_memory:
-            self.memory_store = MemoryStore(db_path="data/memory.db")
-        else:
-            self.memory_store = None
+        if clients is None:
+            clients = create_shared_clients(enable_memory)
+        openai_client, chat_client, memory_store = clients
+
+        # Persistent memory store
+        self.enable_memory = enable_memory and memory_store is not None
+        self.memory_store = memory_store if self.enable_memory else None
         
         # Current user ID for memory isolation
         self._current_user_id: Optional[str] = None
@@ -140,17 +171,9 @@ class LifeAdminAgent:
         # Current model (for fallback support)
         self.current_model = Config.MODEL_NAME
 
-        # Create OpenAI client pointing to GitHub Models endpoint
-        self.openai_client = AsyncOpenAI(
-            base_url=Config.MODEL_ENDPOINT,
-            api_key=Config.GITHUB_TOKEN
-        )
-
-        # Create chat client
-        self.chat_client = OpenAIChatClient(
-            async_client=self.openai_client,
-            model_id=self.current_model
-        )
+        # OpenAI client pointing to GitHub Models endpoint, and its chat client
+        self.openai_client = openai_client
+        self.chat_client = chat_client
 
         # Create the agent with tools
         self.agent = ChatAgent(
@@ -275,7 +298,7 @@ class LifeAdminAgent:
         set_checklist_repository(self.repository)
         set_notification_repository(self.repository)
 
-        return ALL_TOOLS
+        return list(_AI_TOOLS)
     
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count from text (rough approximation)."""
@@ -399,20 +422,22 @@ class LifeAdminAgent:
         # Simple keyword extraction for topics
         topic_keywords = ["document", "subscription", "passport", "license", "moving", 
                          "job", "wedding", "travel", "insurance", "checklist"]
+        message_lower = user_message.lower()
+        response_lower = response.lower()
         for kw in topic_keywords:
-            if kw in user_message.lower() or kw in response.lower():
+            if kw in message_lower or kw in response_lower:
                 self._session_topics.append(kw)
         
         # Extract actions from response
         action_indicators = ["✅", "saved", "created", "added", "deleted", "marked", "sent"]
         for indicator in action_indicators:
-            if indicator in response.lower() or indicator in response:
+            if indicator in response_lower or indicator in response:
                 # Try to extract what action was taken
-                if "document" in response.lower():
+                if "document" in response_lower:
                     self._session_actions.append("managed documents")
-                elif "subscription" in response.lower():
+                elif "subscription" in response_lower:
                     self._session_actions.append("managed subscriptions")
-                elif "checklist" in response.lower() or "task" in response.lower():
+                elif "checklist" in response_lower or "task" in response_lower:
                     self._session_actions.append("managed checklists")
                 break
 
@@ -518,6 +543,10 @@ class LifeAdminAgent:
         if save_to_memory and self.conversation_history:
             self.save_session_summary()
         
+        # Persist access counts queued by cached memory reads
+        if self.memory_store:
+            self.memory_store.flush_access_updates()
+        
         self.thread = self.agent.get_new_thread()
         self.conversation_history = []
         self.conversation_summary = None
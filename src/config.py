@@ -44,6 +44,8 @@ class Config:
     # Agent settings
     AGENT_NAME: str = "Life Admin Assistant"
     MAX_HISTORY_MESSAGES: int = 20 # Keep last N messages in context
+    # User/assistant turns kept in the live thread before older ones are summarized
+    MAX_CONVERSATION_TURNS: int = int(get_secret("MAX_CONVERSATION_TURNS", "4"))
 
     # Tracing/Observability settings
     TRACING_ENABLED: bool = get_secret("TRACING_ENABLED", "true").lower() == "true"
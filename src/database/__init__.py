@@ -3,12 +3,14 @@
 from .models.Document import Document
 from .models.LifeEvent import LifeEvent, ChecklistItem
 from .models.Subscription import Subscription
-from .repository.repository import Repository
+from .repository.repository import Repository, OverviewBundle, SidebarSnapshot
 
 __all__ = [
     "Document",
     "LifeEvent",
     "ChecklistItem",
     "Subscription",
-    "Repository"
+    "Repository",
+    "OverviewBundle",
+    "SidebarSnapshot"
 ]
\ No newline at end of file
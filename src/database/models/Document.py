@@ -7,7 +7,7 @@ from datetime import date, datetime
 from typing import Optional, List
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """
     Represents an important document that needs expiry tracking.
@@ -27,6 +27,8 @@ class Document:
     notes: str = ""
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    # Days left as computed by the query that loaded this document, if any
+    _days_left: Optional[int] = field(default=None, init=False, repr=False, compare=False)
 
     # Valid categories
     VALID_CATEGORIES = [
@@ -36,6 +38,8 @@ class Document:
 
     def days_until_expiry(self) -> int:
         """Calculate days remaining until the document expires."""
+        if self._days_left is not None:
+            return self._days_left
         delta = self.expiry_date - date.today()
         return delta.days
     
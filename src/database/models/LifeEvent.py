@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Optional, List
+import sys
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class ChecklistItem:
     """A single task in a life event checklist."""
     id: str
@@ -14,6 +15,10 @@ class ChecklistItem:
     order: int = 0
     completed_at: Optional[datetime] = None
 
+    def __post_init__(self):
+        # Categories come from a small vocabulary; share one string per value
+        self.category = sys.intern(str(self.category or ""))
+
     def mark_completed(self):
         """Mark the checklist item as completed."""
         self.is_completed = True
@@ -31,7 +36,7 @@ class ChecklistItem:
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
         }
     
-@dataclass
+@dataclass(slots=True)
 class LifeEvent:
     """Major life event with checklist tracking."""
 
@@ -44,22 +49,57 @@ class LifeEvent:
     status: str = "planning"
     notes: str = ""
     created_at: datetime = field(default_factory=datetime.now)
+    # Kept in step by the item mutators below so progress is O(1)
+    _completed_count: int = field(default=0, init=False, repr=False, compare=False)
 
     VALID_EVENT_TYPES = [
         "moving", "new_job", "buying_car", "buying_home",
         "getting_married", "having_baby", "travel", "other"
     ]
 
+    def __post_init__(self):
+        self.event_type = sys.intern(str(self.event_type))
+        self._completed_count = sum(1 for item in self.checklist_items if item.is_completed)
+
     def get_progress(self) -> tuple[int, int]:
         """Return (completed, totoal) counts."""
-        total = len(self.checklist_items)
-        completed = sum(1 for item in self.checklist_items if item.is_completed)
-        return completed, total
+        return self._completed_count, len(self.checklist_items)
     
     def get_progress_percentage(self) -> float:
         """Return completion percentage."""
         completed, total = self.get_progress()
         return (completed / total * 100) if total > 0 else 0.0
+
+    def progress_summary(self) -> tuple[int, int, float]:
+        """Return (completed, total, percentage)."""
+        completed = self._completed_count
+        total = len(self.checklist_items)
+        return completed, total, (completed / total * 100) if total > 0 else 0.0
+
+    def complete_item(self, item: ChecklistItem):
+        """Mark one of this event's items completed."""
+        if not item.is_completed:
+            item.mark_completed()
+            self._completed_count += 1
+
+    def append_item(self, item: ChecklistItem):
+        """Append an item to the checklist."""
+        self.checklist_items.append(item)
+        self._completed_count += item.is_completed
+
+    def remove_item_at(self, index: int) -> ChecklistItem:
+        """Remove and return the item at index, renumbering the items after it."""
+        items = self.checklist_items
+        item = items.pop(index)
+        self._completed_count -= item.is_completed
+        for i in range(index, len(items)):
+            items[i].order = i
+        return item
+
+    def replace_items(self, items: List[ChecklistItem]):
+        """Replace the whole checklist."""
+        self.checklist_items = items
+        self._completed_count = sum(1 for item in items if item.is_completed)
     
     def add_checklist_item(self, item: ChecklistItem):
         """Add a checklist item to the life event."""
@@ -70,13 +110,13 @@ class LifeEvent:
             order=len(self.checklist_items)
         )
 
-        self.checklist_items.append(item)
+        self.append_item(item)
         return item
     
     def mark_item_completed(self, item_id: str) -> bool:
         """Mark a checklist item as completed by ID."""
         for item in self.checklist_items:
             if item.id == item_id:
-                item.mark_completed()
+                self.complete_item(item)
                 return True
         return False
@@ -3,7 +3,18 @@ from datetime import date, datetime
 from typing import Optional
 import uuid
 
-@dataclass
+
+def monthly_cost_for(cost: float, billing_cycle: str) -> float:
+    """Normalize a cost billed every billing_cycle to a monthly amount."""
+    if billing_cycle == "yearly":
+        return cost / 12
+    elif billing_cycle == "weekly":
+        return cost * 4.33
+    else:
+        return cost
+
+
+@dataclass(slots=True)
 class Subscription:
     """Track subscriptions like Netflix, Gym, Spotify, etc."""
 
@@ -22,15 +33,15 @@ class Subscription:
     is_active: bool = True
     notes: str = ""
     created_at: datetime = field(default_factory=datetime.now)
+    # Derived from cost and billing_cycle; refreshed by the repository on save
+    monthly_cost: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.monthly_cost = monthly_cost_for(self.cost, self.billing_cycle)
 
     def get_monthly_cost(self) -> float:
         """Normalize cost to monthly for comparison."""
-        if self.billing_cycle == "yearly":
-            return self.cost / 12
-        elif self.billing_cycle == "weekly":
-            return self.cost * 4.33  
-        else:
-            return self.cost
+        return monthly_cost_for(self.cost, self.billing_cycle)
         
     def get_yearly_cost(self) -> float:
         """Calculate total yearly cost."""
@@ -1,20 +1,372 @@
 import sqlite3
 import json
+import sys
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count
 
 from ..models.Document import Document
 from ..models.LifeEvent import LifeEvent, ChecklistItem
-from ..models.Subscription import Subscription
+from ..models.Subscription import Subscription, monthly_cost_for
+
+
+# Dates are stored as proleptic Gregorian ordinals and timestamps as
+# microseconds since the (naive, local) epoch, so rows round-trip without
+# isoformat() strings. Conversion is explicit at the query boundary rather
+# than through sqlite3's process-wide adapters and converters.
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_day(value: Optional[date]) -> Optional[int]:
+    return value.toordinal() if value is not None else None
+
+
+def _to_micros(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        # Stored timestamps are naive local time, like datetime.now()
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_day(value: Optional[int]) -> Optional[date]:
+    return date.fromordinal(value) if value is not None else None
+
+
+def _from_micros(value: Optional[int]) -> Optional[datetime]:
+    return _EPOCH + timedelta(microseconds=value) if value is not None else None
+
+
+_CREATE_DOCUMENTS = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    family_member TEXT,
+    name TEXT,
+    category TEXT,
+    expiry_date DATE,
+    reminder_days TEXT,
+    notes TEXT,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP
+    )
+"""
+
+_CREATE_DOCUMENTS_NAME_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_documents_user_name_lower
+ON documents(user_id, lower(name))
+"""
+
+# Checklist completion percentage, derived from the persisted counts
+_EVENT_PROGRESS_PCT = (
+    "CASE WHEN total_count > 0 THEN completed_count * 100.0 / total_count ELSE 0.0 END"
+)
+
+_CREATE_LIFE_EVENTS = f"""
+CREATE TABLE IF NOT EXISTS life_events (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    event_type TEXT,
+    title TEXT,
+    target_date DATE,
+    checklist_items TEXT,
+    status TEXT DEFAULT 'planning',
+    notes TEXT,
+    created_at TIMESTAMP,
+    completed_count INTEGER,
+    total_count INTEGER,
+    progress_pct REAL GENERATED ALWAYS AS ({_EVENT_PROGRESS_PCT}) VIRTUAL
+    )
+"""
+
+_CREATE_LIFE_EVENTS_TYPE_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_life_events_user_type
+ON life_events(user_id, event_type)
+"""
+
+_CREATE_SUBSCRIPTIONS = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    service_name TEXT NOT NULL,
+    cost REAL NOT NULL,
+    renewal_date DATE NOT NULL,
+    billing_cycle TEXT DEFAULT 'monthly',
+    category TEXT DEFAULT 'other',
+    is_free_trial INTEGER DEFAULT 0,
+    trial_end_date DATE,
+    is_active INTEGER DEFAULT 1,
+    notes TEXT,
+    created_at TIMESTAMP,
+    monthly_cost REAL
+    )
+"""
+
+_CREATE_SUBSCRIPTIONS_NAME_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_subscriptions_user_name_lower
+ON subscriptions(user_id, lower(service_name))
+"""
+
+# Backfills the persisted monthly cost; mirrors monthly_cost_for()
+_BACKFILL_MONTHLY_COST = """
+UPDATE subscriptions SET monthly_cost = CASE billing_cycle
+    WHEN 'yearly' THEN cost / 12.0
+    WHEN 'weekly' THEN cost * 4.33
+    ELSE cost END
+WHERE monthly_cost IS NULL
+"""
+
+_BACKFILL_EVENT_PROGRESS = """
+UPDATE life_events SET
+    total_count = json_array_length(COALESCE(NULLIF(checklist_items, ''), '[]')),
+    completed_count = (
+        SELECT COUNT(*) FROM json_each(COALESCE(NULLIF(checklist_items, ''), '[]'))
+        WHERE json_extract(value, '$.is_completed')
+    )
+WHERE total_count IS NULL
+"""
+
+
+# Explicit column lists for SELECTs so hydrators can unpack rows
+# positionally instead of looking each column up by name.
+_DOCUMENT_COLUMNS = (
+    "id, family_member, name, category, expiry_date, reminder_days, notes, created_at, updated_at"
+)
+_SUBSCRIPTION_COLUMNS = (
+    "id, service_name, cost, renewal_date, billing_cycle, category, "
+    "is_free_trial, trial_end_date, is_active, notes, created_at, monthly_cost"
+)
+_LIFE_EVENT_COLUMNS = (
+    "id, event_type, title, target_date, checklist_items, status, notes, created_at"
+)
+
+
+# SQL statements are module constants, built once at import rather than
+# formatted on every call.
+_Q_UPSERT_DOC = """
+INSERT INTO documents
+(id, user_id, family_member, name, category, expiry_date, reminder_days, notes, created_at, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    user_id = excluded.user_id,
+    family_member = excluded.family_member,
+    name = excluded.name,
+    category = excluded.category,
+    expiry_date = excluded.expiry_date,
+    reminder_days = excluded.reminder_days,
+    notes = excluded.notes,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at
+"""
+_Q_GET_DOCS_ALL = (
+    f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE user_id = ? ORDER BY expiry_date ASC"
+)
+_Q_GET_DOCS_BY_CAT = (
+    f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE user_id = ? AND category = ? ORDER BY expiry_date ASC"
+)
+_Q_GET_EXPIRING_DOCS = (
+    f"SELECT {_DOCUMENT_COLUMNS}, expiry_date - ? FROM documents "
+    "WHERE user_id = ? AND expiry_date <= ? ORDER BY expiry_date ASC"
+)
+_Q_GET_DOC_BY_NAME = (
+    f"SELECT {_DOCUMENT_COLUMNS} FROM documents "
+    "WHERE user_id = ? AND lower(name) = ? ORDER BY expiry_date ASC LIMIT 1"
+)
+_Q_DELETE_DOC = "DELETE FROM documents WHERE id = ? AND user_id = ?"
+
+_Q_UPSERT_SUB = """
+INSERT INTO subscriptions
+(id, user_id, service_name, cost, renewal_date, billing_cycle, category,
+ is_free_trial, trial_end_date, is_active, notes, created_at, monthly_cost)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    user_id = excluded.user_id,
+    service_name = excluded.service_name,
+    cost = excluded.cost,
+    renewal_date = excluded.renewal_date,
+    billing_cycle = excluded.billing_cycle,
+    category = excluded.category,
+    is_free_trial = excluded.is_free_trial,
+    trial_end_date = excluded.trial_end_date,
+    is_active = excluded.is_active,
+    notes = excluded.notes,
+    created_at = excluded.created_at,
+    monthly_cost = excluded.monthly_cost
+"""
+_Q_GET_SUBS_ALL = (
+    f"SELECT {_SUBSCRIPTION_COLUMNS} FROM subscriptions WHERE user_id = ? ORDER BY renewal_date ASC"
+)
+_Q_GET_SUBS_ACTIVE = (
+    f"SELECT {_SUBSCRIPTION_COLUMNS} FROM subscriptions WHERE user_id = ? AND is_active = 1 ORDER BY renewal_date ASC"
+)
+_Q_GET_FREE_TRIALS = (
+    f"SELECT {_SUBSCRIPTION_COLUMNS} FROM subscriptions "
+    "WHERE user_id = ? AND is_free_trial = 1 AND is_active = 1 ORDER BY trial_end_date ASC"
+)
+_Q_GET_ENDING_TRIALS = (
+    f"SELECT {_SUBSCRIPTION_COLUMNS}, trial_end_date - ? FROM subscriptions "
+    "WHERE user_id = ? AND is_free_trial = 1 AND is_active = 1 "
+    "AND trial_end_date IS NOT NULL AND trial_end_date <= ? ORDER BY trial_end_date ASC"
+)
+_Q_SUBS_BY_CATEGORY = """
+SELECT coalesce(nullif(category, ''), 'other') AS cat, COUNT(*), SUM(monthly_cost) AS total
+FROM subscriptions
+WHERE user_id = ?
+GROUP BY cat
+ORDER BY total DESC, MIN(renewal_date) ASC
+"""
+_Q_SIDEBAR_DOCS = """
+SELECT COUNT(*), COALESCE(SUM(expiry_date <= :end), 0)
+FROM documents WHERE user_id = :user_id
+"""
+_Q_SIDEBAR_EXPIRING = """
+SELECT name, expiry_date - :today FROM documents
+WHERE user_id = :user_id AND expiry_date <= :end
+ORDER BY expiry_date ASC LIMIT :limit
+"""
+_Q_SIDEBAR_SPENDING = """
+SELECT COALESCE(SUM(monthly_cost), 0) FROM subscriptions
+WHERE user_id = :user_id AND is_active = 1 AND is_free_trial = 0
+"""
+_Q_SIDEBAR_TRIALS = """
+SELECT service_name, trial_end_date - :today FROM subscriptions
+WHERE user_id = :user_id AND is_free_trial = 1 AND is_active = 1
+  AND trial_end_date IS NOT NULL AND trial_end_date <= :trial_end
+ORDER BY trial_end_date ASC LIMIT :limit
+"""
+_Q_SIDEBAR_EVENTS = """
+SELECT COUNT(*), COALESCE(SUM(completed_count), 0), COALESCE(SUM(total_count), 0)
+FROM life_events WHERE user_id = :user_id AND status != 'completed'
+"""
+_Q_GET_SUB_BY_NAME = (
+    f"SELECT {_SUBSCRIPTION_COLUMNS} FROM subscriptions "
+    "WHERE user_id = ? AND lower(service_name) = ? ORDER BY renewal_date ASC LIMIT 1"
+)
+_Q_DELETE_SUB = "DELETE FROM subscriptions WHERE id = ? AND user_id = ?"
+
+_Q_UPSERT_EVENT = """
+INSERT INTO life_events
+(id, user_id, event_type, title, target_date, checklist_items, status, notes, created_at,
+ completed_count, total_count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    user_id = excluded.user_id,
+    event_type = excluded.event_type,
+    title = excluded.title,
+    target_date = excluded.target_date,
+    checklist_items = excluded.checklist_items,
+    status = excluded.status,
+    notes = excluded.notes,
+    created_at = excluded.created_at,
+    completed_count = excluded.completed_count,
+    total_count = excluded.total_count
+"""
+_Q_GET_EVENTS_ALL = (
+    f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events WHERE user_id = ? ORDER BY target_date ASC"
+)
+_Q_GET_EVENTS_BY_STATUS = (
+    f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events WHERE user_id = ? AND status = ? ORDER BY target_date ASC"
+)
+
+
+@lru_cache(maxsize=8)
+def _q_get_events_by_statuses(n: int) -> str:
+    """Events matching any of n statuses, grouped in the order the statuses were given."""
+    placeholders = ", ".join("?" * n)
+    rank = " ".join(f"WHEN ? THEN {i}" for i in range(n))
+    return (
+        f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events "
+        f"WHERE user_id = ? AND status IN ({placeholders}) "
+        f"ORDER BY CASE status {rank} END, target_date ASC"
+    )
+
+
+_Q_GET_ACTIVE_EVENTS = (
+    f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events "
+    "WHERE user_id = ? AND status IN ('planning', 'in_progress') "
+    "ORDER BY status = 'in_progress', target_date ASC"
+)
+_Q_GET_ACTIVE_EVENTS_BY_TYPE = (
+    f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events "
+    "WHERE user_id = ? AND event_type = ? AND status IN ('planning', 'in_progress') "
+    "ORDER BY status = 'in_progress', target_date ASC"
+)
+_Q_GET_EVENTS_BY_TYPE = (
+    f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events WHERE user_id = ? AND event_type = ? ORDER BY target_date ASC"
+)
+_Q_FIND_EVENT = (
+    f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events "
+    "WHERE user_id = ? AND (instr(lower(event_type), ?) > 0 OR instr(lower(title), ?) > 0) "
+    "ORDER BY target_date ASC LIMIT 1"
+)
+_Q_GET_EVENT = f"SELECT {_LIFE_EVENT_COLUMNS} FROM life_events WHERE id = ? AND user_id = ?"
+
+# Everything a reminder needs in one pass: expiring documents (including
+# already expired), ending free trials, and active events due in the window.
+# Dates are day ordinals, so "date - today" is the number of days left.
+_Q_ATTENTION_ITEMS = """
+SELECT 'document', id, name, expiry_date - :today, NULL, NULL, NULL, 0 AS grp, expiry_date AS ord
+FROM documents
+WHERE user_id = :user_id AND expiry_date <= :end
+UNION ALL
+SELECT 'trial', id, service_name, trial_end_date - :today, cost, billing_cycle, NULL, 1, trial_end_date
+FROM subscriptions
+WHERE user_id = :user_id AND is_free_trial = 1 AND is_active = 1
+  AND trial_end_date IS NOT NULL AND trial_end_date <= :end
+UNION ALL
+SELECT 'event', id, title, target_date - :today, NULL, NULL, progress_pct,
+       CASE status WHEN 'planning' THEN 2 ELSE 3 END, target_date
+FROM life_events
+WHERE user_id = :user_id AND status IN ('planning', 'in_progress')
+  AND target_date BETWEEN :today AND :end
+ORDER BY grp, ord
+"""
+_Q_DELETE_EVENT = "DELETE FROM life_events WHERE id = ? AND user_id = ?"
+
+
+@dataclass(slots=True)
+class OverviewBundle:
+    """Everything the overview tab shows, loaded in one read transaction."""
+    docs: List[Document]
+    subs: List[Subscription]
+    events: List[LifeEvent]
+    expiring: List[Document]
+    spending_summary: dict
+    by_category: Dict[str, Tuple[int, float]]
+
+
+@dataclass(slots=True)
+class SidebarSnapshot:
+    """Counts, totals and short previews for the sidebar dashboard."""
+    total_docs: int
+    expiring_count: int
+    expiring_preview: List[Tuple[str, int]]  # (name, days_left)
+    monthly_total: float
+    yearly_total: float
+    ending_trials: List[Tuple[str, int]]  # (service_name, days_left)
+    active_events: int
+    completed_tasks: int
+    total_tasks: int
+
 
 class Repository:
     """Database operations for Life Admin Assistant."""
 
+    # Per database file, bumped after every committed write from this process.
+    # Shared across instances so caches keyed on it see writes from any of them.
+    _data_versions: Dict[str, int] = {}
+    _version_counter = count(1)
+
     def __init__(self, db_path: str = "data/life_admin.db", user_id: str = None):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._version_key = str(self.db_path.resolve())
         self.user_id = user_id  # Current user's ID for data isolation
         self._init_database()
     
@@ -22,14 +374,36 @@ class Repository:
         """Set the current user for data filtering."""
         self.user_id = user_id
 
+    @property
+    def db_key(self) -> str:
+        """Resolved path of the database file; identifies it in cache keys."""
+        return self._version_key
+
+    @property
+    def data_version(self) -> int:
+        """Version of the data in this database file; changes after each write."""
+        return Repository._data_versions.get(self._version_key, 0)
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Open a new connection to this database, configured like every other one."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=check_same_thread
+        )
+        conn.row_factory = sqlite3.Row # Access columns by name
+        # With WAL, NORMAL only syncs at checkpoints and stays corruption-safe
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     @contextmanager
-    def _get_connection(self):
+    def _get_connection(self, write: bool = False):
         """Context manager for safe database connection."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row # Access columns by name
+        conn = self._connect()
         try:
             yield conn
             conn.commit()
+            if write:
+                Repository._data_versions[self._version_key] = next(Repository._version_counter)
         except Exception as e:
             conn.rollback()
             raise e
@@ -42,63 +416,46 @@ class Repository:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL lets readers run alongside a writer instead of blocking on it
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Documents table
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS documents (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                family_member TEXT,
-                name TEXT,
-                category TEXT,
-                expiry_date TEXT,
-                reminder_days TEXT,
-                notes TEXT,
-                created_at TEXT,
-                updated_at TEXT
-                )
-            """)
+            cursor.execute(_CREATE_DOCUMENTS)
             
             # Migration: Add user_id column if it doesn't exist
             self._migrate_add_user_id_column(cursor, "documents")
+            self._migrate_integer_dates(
+                cursor, "documents", _CREATE_DOCUMENTS,
+                date_columns=("expiry_date",),
+                timestamp_columns=("created_at", "updated_at")
+            )
+            cursor.execute(_CREATE_DOCUMENTS_NAME_INDEX)
 
             # Life events table
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS life_events (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                event_type TEXT,
-                title TEXT,
-                target_date TEXT,
-                checklist_items TEXT,
-                status TEXT DEFAULT 'planning',
-                notes TEXT,
-                created_at TEXT
-                )
-            """)
+            cursor.execute(_CREATE_LIFE_EVENTS)
             
             # Migration: Add user_id column if it doesn't exist
             self._migrate_add_user_id_column(cursor, "life_events")
+            self._migrate_integer_dates(
+                cursor, "life_events", _CREATE_LIFE_EVENTS,
+                date_columns=("target_date",),
+                timestamp_columns=("created_at",)
+            )
+            self._migrate_add_event_progress_columns(cursor)
+            cursor.execute(_CREATE_LIFE_EVENTS_TYPE_INDEX)
 
             # Subscriptions table
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS subscriptions (
-                id TEXT PRIMARY KEY,
-                user_id TEXT,
-                service_name TEXT NOT NULL,
-                cost REAL NOT NULL,
-                renewal_date TEXT NOT NULL,
-                billing_cycle TEXT DEFAULT 'monthly',
-                category TEXT DEFAULT 'other',
-                is_free_trial INTEGER DEFAULT 0,
-                trial_end_date TEXT,
-                is_active INTEGER DEFAULT 1,
-                notes TEXT,
-                created_at TEXT
-                )
-            """)
+            cursor.execute(_CREATE_SUBSCRIPTIONS)
             
             # Migration: Add user_id column if it doesn't exist
             self._migrate_add_user_id_column(cursor, "subscriptions")
+            self._migrate_integer_dates(
+                cursor, "subscriptions", _CREATE_SUBSCRIPTIONS,
+                date_columns=("renewal_date", "trial_end_date"),
+                timestamp_columns=("created_at",)
+            )
+            self._migrate_add_monthly_cost_column(cursor)
+            cursor.execute(_CREATE_SUBSCRIPTIONS_NAME_INDEX)
     
     def _migrate_add_user_id_column(self, cursor, table_name: str):
         """Add user_id column to existing tables if missing."""
@@ -107,145 +464,292 @@ class Repository:
         if "user_id" not in columns:
             cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN user_id TEXT")
 
+    def _migrate_add_monthly_cost_column(self, cursor):
+        """Add and backfill the persisted monthly_cost column on subscriptions."""
+        cursor.execute("PRAGMA table_info(subscriptions)")
+        columns = [col[1] for col in cursor.fetchall()]
+        if "monthly_cost" not in columns:
+            cursor.execute("ALTER TABLE subscriptions ADD COLUMN monthly_cost REAL")
+        cursor.execute(_BACKFILL_MONTHLY_COST)
+
+    def _migrate_add_event_progress_columns(self, cursor):
+        """Add and backfill the persisted checklist progress columns on life_events."""
+        # table_xinfo, unlike table_info, also lists generated columns
+        cursor.execute("PRAGMA table_xinfo(life_events)")
+        columns = [col[1] for col in cursor.fetchall()]
+        for column in ("completed_count", "total_count"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE life_events ADD COLUMN {column} INTEGER")
+        if "progress_pct" not in columns:
+            cursor.execute(
+                "ALTER TABLE life_events ADD COLUMN progress_pct REAL "
+                f"GENERATED ALWAYS AS ({_EVENT_PROGRESS_PCT}) VIRTUAL"
+            )
+        cursor.execute(_BACKFILL_EVENT_PROGRESS)
+
+    def _migrate_integer_dates(self, cursor, table_name: str, create_sql: str,
+                               date_columns: tuple, timestamp_columns: tuple):
+        """
+        Rebuild tables created with ISO-text date columns as DATE/TIMESTAMP integers.
+
+        The rename, create, copy and drop run in one BEGIN IMMEDIATE
+        transaction, so a failed conversion or a crash leaves the original
+        table untouched and a concurrent first start waits, then re-checks.
+        A {table}_legacy left behind by an interrupted rebuild is resolved
+        before the column types are trusted.
+        """
+        legacy_table = f"{table_name}_legacy"
+        if not self._needs_date_rebuild(cursor, table_name, legacy_table, date_columns[0]):
+            return
+
+        conn = cursor.connection
+        if conn.in_transaction:
+            conn.commit()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Another connection may have finished the rebuild while we waited
+            if self._needs_date_rebuild(cursor, table_name, legacy_table, date_columns[0]):
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (legacy_table,))
+                if not cursor.fetchone():
+                    cursor.execute(f"ALTER TABLE {table_name} RENAME TO {legacy_table}")
+                    cursor.execute(create_sql)
+                self._copy_legacy_rows(cursor, table_name, legacy_table, date_columns, timestamp_columns)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _needs_date_rebuild(cursor, table_name: str, legacy_table: str, date_column: str) -> bool:
+        """Whether the table still has text dates or an interrupted rebuild left its legacy copy."""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (legacy_table,))
+        if cursor.fetchone():
+            return True
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        column_types = {col[1]: col[2].upper() for col in cursor.fetchall()}
+        return column_types.get(date_column) != "DATE"
+
+    @staticmethod
+    def _copy_legacy_rows(cursor, table_name: str, legacy_table: str,
+                          date_columns: tuple, timestamp_columns: tuple):
+        """
+        Convert every row of legacy_table into table_name, then drop it.
+        Rows whose id already exists are kept as they are, so resuming after
+        an interrupted rebuild never overwrites rows written since. An
+        unparseable timestamp becomes NULL; an unparseable date raises.
+        """
+        def convert_timestamp(value):
+            try:
+                return _to_micros(datetime.fromisoformat(value))
+            except ValueError:
+                return None
+
+        cursor.execute(f"SELECT * FROM {legacy_table}")
+        rows = cursor.fetchall()
+        if rows:
+            columns = rows[0].keys()
+            converters = {col: lambda v: date.fromisoformat(v).toordinal() for col in date_columns}
+            converters.update({col: convert_timestamp for col in timestamp_columns})
+            cursor.executemany(
+                f"INSERT OR IGNORE INTO {table_name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [
+                    tuple(
+                        converters[col](row[col]) if col in converters and isinstance(row[col], str) else row[col]
+                        for col in columns
+                    )
+                    for row in rows
+                ]
+            )
+        cursor.execute(f"DROP TABLE {legacy_table}")
+
 
     # DOCUMENT OPERATIONS
 
     def save_document(self, document: Document) -> Document:
         """Save or update a document."""
-        with self._get_connection() as conn:
+        self.save_documents([document])
+        return document
+
+    def save_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """Save or update several documents in a single transaction."""
+        documents = list(documents)
+        updated_at = _to_micros(datetime.now())
+        with self._get_connection(write=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-            INSERT OR REPLACE INTO documents
-            (id, user_id, name, category, expiry_date, reminder_days, notes, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.executemany(_Q_UPSERT_DOC, ((
                 document.id,
                 self.user_id,
+                document.family_member,
                 document.name,
                 document.category,
-                document.expiry_date.isoformat(),
+                _to_day(document.expiry_date),
                 json.dumps(document.reminder_days),
                 document.notes,
-                document.created_at.isoformat(),
-                datetime.now().isoformat()
-            ))
-        return document
+                _to_micros(document.created_at),
+                updated_at
+            ) for document in documents))
+        return documents
     
     def get_documents(self, category: Optional[str] = None) -> List[Document]:
         """Get all documents for current user, optionally filtered by category."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             if category:
-                cursor.execute(
-                    "SELECT * FROM documents WHERE user_id = ? AND category = ? ORDER BY expiry_date ASC",
-                    (self.user_id, category)
-                )
+                cursor.execute(_Q_GET_DOCS_BY_CAT, (self.user_id, category))
             else:
-                cursor.execute(
-                    "SELECT * FROM documents WHERE user_id = ? ORDER BY expiry_date ASC",
-                    (self.user_id,)
-                )
+                cursor.execute(_Q_GET_DOCS_ALL, (self.user_id,))
             return [self._row_to_document(row) for row in cursor.fetchall()]
         
 
     def get_expiring_documents(self, days_ahead: int = 30) -> List[Document]:
-        """Get documents expiring within N days for current user."""
-        end_date = date.today() + timedelta(days=days_ahead)
+        """Get documents expiring within N days for current user, with days left precomputed."""
+        today = date.today()
+        end_date = today + timedelta(days=days_ahead)
+        documents = []
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-            SELECT * FROM documents
-            WHERE user_id = ? AND DATE(expiry_date) <= DATE(?)
-            ORDER BY expiry_date ASC
-            """, (self.user_id, end_date.isoformat()))
-            return [self._row_to_document(row) for row in cursor.fetchall()]
+            cursor.execute(_Q_GET_EXPIRING_DOCS, (_to_day(today), self.user_id, _to_day(end_date)))
+            for row in cursor.fetchall():
+                # Dates are day ordinals, so the extra column is the days left
+                document = self._row_to_document(row[:-1])
+                document._days_left = row[-1]
+                documents.append(document)
+        return documents
     
+    def get_document_by_name(self, name: str) -> Optional[Document]:
+        """Get the current user's document with this name (case-insensitive)."""
+        needle = name.lower()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_Q_GET_DOC_BY_NAME, (self.user_id, needle))
+            row = cursor.fetchone()
+        if row:
+            return self._row_to_document(row)
+        if not needle.isascii():
+            # SQLite's lower() only folds ASCII, so fall back to Python for other names
+            for document in self.get_documents():
+                if document.name.lower() == needle:
+                    return document
+        return None
+
     def delete_document(self, document_id: str) -> bool:
         """Delete a document by ID (only if owned by current user)."""
-        with self._get_connection() as conn:
+        with self._get_connection(write=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM documents WHERE id = ? AND user_id = ?", (document_id, self.user_id))
+            cursor.execute(_Q_DELETE_DOC, (document_id, self.user_id))
             return cursor.rowcount > 0
     
     def _row_to_document(self, row) -> Document:
         """Convert a database row to a Document object."""
-        return Document(
-            id=row["id"],
-            name=row["name"],
-            category=row["category"],
-            expiry_date=date.fromisoformat(row["expiry_date"]),
-            family_member=row["family_member"] if "family_member" in row.keys() else "self",
-            reminder_days=json.loads(row["reminder_days"]) if row["reminder_days"] else [90, 30, 7],
-            notes=row["notes"] if row["notes"] else "",
-            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.now(),
-            updated_at=datetime.fromisoformat(row["updated_at"]) if row["updated_at"] else datetime.now()
-        )
+        (doc_id, family_member, name, category, expiry_date,
+         reminder_days, notes, created_at, updated_at) = row
+        # Models are slotted dataclasses; fill the slots directly rather than
+        # going through the generated __init__ for every row.
+        document = object.__new__(Document)
+        document.id = doc_id
+        document.user_id = "default"
+        document.family_member = family_member
+        document.name = name
+        document.category = category
+        document.expiry_date = _from_day(expiry_date)
+        document.reminder_days = json.loads(reminder_days) if reminder_days else [90, 30, 7]
+        document.notes = notes if notes else ""
+        document.created_at = _from_micros(created_at) or datetime.now()
+        document.updated_at = _from_micros(updated_at) or datetime.now()
+        document._days_left = None
+        return document
+
     # SUBSCRIPTION OPERATIONS
 
     def save_subscription(self, subscription: Subscription) -> Subscription:
         """Save or update a subscription."""
-        with self._get_connection() as conn:
+        self.save_subscriptions([subscription])
+        return subscription
+
+    def save_subscriptions(self, subscriptions: Iterable[Subscription]) -> List[Subscription]:
+        """Save or update several subscriptions in a single transaction."""
+        subscriptions = list(subscriptions)
+        # cost or billing_cycle may have changed since construction
+        for subscription in subscriptions:
+            subscription.monthly_cost = monthly_cost_for(subscription.cost, subscription.billing_cycle)
+        with self._get_connection(write=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-            INSERT OR REPLACE INTO subscriptions
-            (id, user_id, service_name, cost, renewal_date, billing_cycle, category,
-             is_free_trial, trial_end_date, is_active, notes, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.executemany(_Q_UPSERT_SUB, ((
                 subscription.id,
                 self.user_id,
                 subscription.service_name,
                 subscription.cost,
-                subscription.renewal_date.isoformat(),
+                _to_day(subscription.renewal_date),
                 subscription.billing_cycle,
                 subscription.category,
                 int(subscription.is_free_trial),
-                subscription.trial_end_date.isoformat() if subscription.trial_end_date else None,
+                _to_day(subscription.trial_end_date),
                 int(subscription.is_active),
                 subscription.notes,
-                subscription.created_at.isoformat()
-            ))
-        return subscription
+                _to_micros(subscription.created_at),
+                subscription.monthly_cost
+            ) for subscription in subscriptions))
+        return subscriptions
 
     def get_subscriptions(self, active_only: bool = False) -> List[Subscription]:
         """Get all subscriptions for current user, optionally filtering only active ones."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             if active_only:
-                cursor.execute(
-                    "SELECT * FROM subscriptions WHERE user_id = ? AND is_active = 1 ORDER BY renewal_date ASC",
-                    (self.user_id,)
-                )
+                cursor.execute(_Q_GET_SUBS_ACTIVE, (self.user_id,))
             else:
-                cursor.execute(
-                    "SELECT * FROM subscriptions WHERE user_id = ? ORDER BY renewal_date ASC",
-                    (self.user_id,)
-                )
+                cursor.execute(_Q_GET_SUBS_ALL, (self.user_id,))
             return [self._row_to_subscription(row) for row in cursor.fetchall()]
     
     def get_free_trials(self) -> List[Subscription]:
         """Get all active free trials for current user."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM subscriptions 
-                WHERE user_id = ? AND is_free_trial = 1 AND is_active = 1
-                ORDER BY trial_end_date ASC
-            """, (self.user_id,))
+            cursor.execute(_Q_GET_FREE_TRIALS, (self.user_id,))
             return [self._row_to_subscription(row) for row in cursor.fetchall()]
 
+    def get_ending_trials(self, days_ahead: int = 7) -> List[Tuple[Subscription, int]]:
+        """Get active free trials ending within N days (or already ended) as (trial, days_left) pairs."""
+        today = date.today()
+        end_date = today + timedelta(days=days_ahead)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_Q_GET_ENDING_TRIALS, (_to_day(today), self.user_id, _to_day(end_date)))
+            return [(self._row_to_subscription(row[:-1]), row[-1]) for row in cursor.fetchall()]
+
+    def find_subscription_by_name(self, name: str) -> Optional[Subscription]:
+        """Get the current user's subscription with this service name (case-insensitive)."""
+        needle = name.lower()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_Q_GET_SUB_BY_NAME, (self.user_id, needle))
+            row = cursor.fetchone()
+        if row:
+            return self._row_to_subscription(row)
+        if not needle.isascii():
+            # SQLite's lower() only folds ASCII, so fall back to Python for other names
+            for subscription in self.get_subscriptions():
+                if subscription.service_name.lower() == needle:
+                    return subscription
+        return None
+
     def delete_subscription(self, subscription_id: str) -> bool:
         """Delete a subscription by ID (only if owned by current user)."""
-        with self._get_connection() as conn:
+        with self._get_connection(write=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM subscriptions WHERE id = ? AND user_id = ?", (subscription_id, self.user_id))
+            cursor.execute(_Q_DELETE_SUB, (subscription_id, self.user_id))
             return cursor.rowcount > 0
         
     def get_spending_summary(self) -> dict:
         """Calculate monthly/yearly spending on active subscriptions."""
-        subscriptions = self.get_subscriptions(active_only=True)
+        return self._summarize_spending(self.get_subscriptions(active_only=True))
+
+    @staticmethod
+    def _summarize_spending(subscriptions: List[Subscription]) -> dict:
+        """Monthly/yearly totals over already-loaded active subscriptions."""
         monthly_total = sum(
-            sub.get_monthly_cost()
+            sub.monthly_cost
             for sub in subscriptions
             if not sub.is_free_trial
         )
@@ -258,37 +762,42 @@ class Repository:
     
     def _row_to_subscription(self, row) -> Subscription:
         """Convert a database row to a Subscription object."""
-        return Subscription(
-            id=row["id"],
-            service_name=row["service_name"],
-            cost=row["cost"],
-            renewal_date=date.fromisoformat(row["renewal_date"]),
-            billing_cycle=row["billing_cycle"] if row["billing_cycle"] else "monthly",
-            category=row["category"] if row["category"] else "other",
-            is_free_trial=bool(row["is_free_trial"]),
-            trial_end_date=date.fromisoformat(row["trial_end_date"]) if row["trial_end_date"] else None,
-            is_active=bool(row["is_active"]),
-            notes=row["notes"] if row["notes"] else "",
-            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.now()
+        (sub_id, service_name, cost, renewal_date, billing_cycle, category,
+         is_free_trial, trial_end_date, is_active, notes, created_at, monthly_cost) = row
+        subscription = object.__new__(Subscription)
+        subscription.id = sub_id
+        subscription.user_id = "default"
+        subscription.service_name = service_name
+        subscription.cost = cost
+        subscription.renewal_date = _from_day(renewal_date)
+        subscription.billing_cycle = billing_cycle if billing_cycle else "monthly"
+        subscription.category = category if category else "other"
+        subscription.is_free_trial = bool(is_free_trial)
+        subscription.trial_end_date = _from_day(trial_end_date)
+        subscription.is_active = bool(is_active)
+        subscription.notes = notes if notes else ""
+        subscription.created_at = _from_micros(created_at) or datetime.now()
+        subscription.monthly_cost = (
+            monthly_cost if monthly_cost is not None
+            else monthly_cost_for(cost, subscription.billing_cycle)
         )
+        return subscription
+
     # LIFE EVENT OPERATIONS
 
     def save_life_event(self, event: LifeEvent) -> LifeEvent:
-        """Save or update a life event."""
-        with self._get_connection() as conn:
+        """Save or update a life event, persisting its progress counts alongside the checklist."""
+        completed, total = event.get_progress()
+        with self._get_connection(write=True) as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT OR REPLACE INTO life_events
-                (id, user_id, event_type, title, target_date, checklist_items, status, notes, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _Q_UPSERT_EVENT,
                 (
                     event.id,
                     self.user_id,
                     event.event_type,
                     event.title,
-                    event.target_date.isoformat(),
+                    _to_day(event.target_date),
                     json.dumps([{
                         "id": item.id,
                         "title": item.title,
@@ -300,7 +809,9 @@ class Repository:
                     } for item in event.checklist_items]),
                     event.status,
                     event.notes,
-                    event.created_at.isoformat(),
+                    _to_micros(event.created_at),
+                    completed,
+                    total,
                 ),
             )
         return event
@@ -320,65 +831,262 @@ class Repository:
         self.save_life_event(event)
         return True
     
-    def get_life_events(self, status: Optional[str] = None) -> List[LifeEvent]:
-        """Get all life events for current user, optionally filtered by status."""
+    def get_life_events(self, status: Union[str, Sequence[str], None] = None) -> List[LifeEvent]:
+        """Get all life events for current user, optionally filtered by one status or a list of them."""
+        return list(self.iter_life_events(status))
+
+    def iter_life_events(self, status: Union[str, Sequence[str], None] = None) -> Iterator[LifeEvent]:
+        """Yield life events for current user one row at a time, optionally filtered by status.
+
+        A list of statuses is matched in one query; results are grouped by
+        status in the order given, then by target date.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            if status:
-                cursor.execute(
-                    "SELECT * FROM life_events WHERE user_id = ? AND status = ? ORDER BY target_date ASC",
-                    (self.user_id, status)
-                )
+            if not status:
+                cursor.execute(_Q_GET_EVENTS_ALL, (self.user_id,))
+            elif isinstance(status, str):
+                cursor.execute(_Q_GET_EVENTS_BY_STATUS, (self.user_id, status))
             else:
+                statuses = tuple(status)
                 cursor.execute(
-                    "SELECT * FROM life_events WHERE user_id = ? ORDER BY target_date ASC",
-                    (self.user_id,)
+                    _q_get_events_by_statuses(len(statuses)),
+                    (self.user_id, *statuses, *statuses),
                 )
+            for row in cursor:
+                yield self._row_to_life_event(row)
+
+    def get_active_life_events(self, event_type: Optional[str] = None) -> List[LifeEvent]:
+        """Get planning and in-progress life events for current user, planning first."""
+        return list(self.iter_active_life_events(event_type))
+
+    def iter_active_life_events(self, event_type: Optional[str] = None) -> Iterator[LifeEvent]:
+        """Yield planning and in-progress life events for current user, planning first."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if event_type:
+                cursor.execute(_Q_GET_ACTIVE_EVENTS_BY_TYPE, (self.user_id, event_type))
+            else:
+                cursor.execute(_Q_GET_ACTIVE_EVENTS, (self.user_id,))
+            for row in cursor:
+                yield self._row_to_life_event(row)
+
+    def get_life_events_by_type(self, event_type: str) -> List[LifeEvent]:
+        """Get all life events of one type for current user."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_Q_GET_EVENTS_BY_TYPE, (self.user_id, event_type))
             return [self._row_to_life_event(row) for row in cursor.fetchall()]
 
+    def find_life_event(self, identifier: str) -> Optional[LifeEvent]:
+        """Get the first life event whose type or title contains identifier (case-insensitive)."""
+        needle = identifier.lower()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_Q_FIND_EVENT, (self.user_id, needle, needle))
+            row = cursor.fetchone()
+        if row:
+            return self._row_to_life_event(row)
+        if not needle.isascii():
+            # SQLite's lower() only folds ASCII, so fall back to Python for other identifiers
+            for event in self.iter_life_events():
+                if needle in event.event_type.lower() or needle in event.title.lower():
+                    return event
+        return None
+
     def get_life_event(self, event_id: str) -> Optional[LifeEvent]:
         """Get a single life event by ID (only if owned by current user)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM life_events WHERE id = ? AND user_id = ?", (event_id, self.user_id))
+            cursor.execute(_Q_GET_EVENT, (event_id, self.user_id))
             row = cursor.fetchone()
             if row:
                 return self._row_to_life_event(row)
             return None
 
+    def get_attention_items(self, days_ahead: int = 30) -> List[tuple]:
+        """
+        Get documents, free trials and active life events due within N days
+        for current user, as (kind, id, name, days_left, extra) tuples.
+
+        kind is 'document', 'trial' or 'event'. extra is None for documents,
+        (cost, billing_cycle) for trials and the completion percentage for events.
+        """
+        today = date.today()
+        params = {
+            "user_id": self.user_id,
+            "today": _to_day(today),
+            "end": _to_day(today + timedelta(days=days_ahead)),
+        }
+        items = []
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_Q_ATTENTION_ITEMS, params)
+            for kind, item_id, name, days, cost, billing_cycle, percentage, _, _ in cursor:
+                if kind == "trial":
+                    extra = (cost, billing_cycle)
+                elif kind == "event":
+                    extra = float(percentage)
+                else:
+                    extra = None
+                items.append((kind, item_id, name, days, extra))
+        return items
+
+    def get_sidebar_snapshot(self, days_ahead: int = 30, trial_days: int = 7,
+                             preview: int = 3, trial_preview: int = 2) -> SidebarSnapshot:
+        """
+        Sidebar counts and totals for current user, aggregated in SQL over
+        one connection; only the few rows the sidebar previews are fetched.
+        """
+        today = date.today()
+        params = {
+            "user_id": self.user_id,
+            "today": _to_day(today),
+            "end": _to_day(today + timedelta(days=days_ahead)),
+            "trial_end": _to_day(today + timedelta(days=trial_days)),
+        }
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            total_docs, expiring_count = cursor.execute(_Q_SIDEBAR_DOCS, params).fetchone()
+            expiring = cursor.execute(_Q_SIDEBAR_EXPIRING, {**params, "limit": preview}).fetchall()
+            monthly_total = float(cursor.execute(_Q_SIDEBAR_SPENDING, params).fetchone()[0])
+            trials = cursor.execute(_Q_SIDEBAR_TRIALS, {**params, "limit": trial_preview}).fetchall()
+            active_events, completed_tasks, total_tasks = cursor.execute(_Q_SIDEBAR_EVENTS, params).fetchone()
+
+        return SidebarSnapshot(
+            total_docs=total_docs,
+            expiring_count=expiring_count,
+            expiring_preview=[tuple(row) for row in expiring],
+            monthly_total=round(monthly_total, 2),
+            yearly_total=round(monthly_total * 12, 2),
+            ending_trials=[tuple(row) for row in trials],
+            active_events=active_events,
+            completed_tasks=completed_tasks,
+            total_tasks=total_tasks,
+        )
+
+    def get_overview_bundle(self, days_ahead: int = 30) -> OverviewBundle:
+        """
+        Load all documents, subscriptions and life events for current user
+        over one connection, with the per-category (count, monthly cost)
+        rollup grouped in SQL and ordered by cost, highest first. The
+        expiring documents and spending summary are derived from the
+        loaded lists.
+        """
+        today = date.today()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute(_Q_GET_DOCS_ALL, (self.user_id,))
+            docs = [self._row_to_document(row) for row in cursor.fetchall()]
+            cursor.execute(_Q_GET_SUBS_ALL, (self.user_id,))
+            subs = [self._row_to_subscription(row) for row in cursor.fetchall()]
+            cursor.execute(_Q_GET_EVENTS_ALL, (self.user_id,))
+            events = [self._row_to_life_event(row) for row in cursor.fetchall()]
+            cursor.execute(_Q_SUBS_BY_CATEGORY, (self.user_id,))
+            by_category = {category: (n, total) for category, n, total in cursor.fetchall()}
+
+        # Documents are ordered by expiry date, so the expiring ones are a prefix
+        expiring = []
+        for document in docs:
+            days = (document.expiry_date - today).days
+            if days > days_ahead:
+                break
+            document._days_left = days
+            expiring.append(document)
+
+        return OverviewBundle(
+            docs=docs,
+            subs=subs,
+            events=events,
+            expiring=expiring,
+            spending_summary=self._summarize_spending([sub for sub in subs if sub.is_active]),
+            by_category=by_category,
+        )
+
+    def get_digest_payload(self, today: Optional[date] = None) -> dict:
+        """
+        Load everything the daily digest needs over one connection and one
+        read transaction, so all parts see the same snapshot.
+
+        Returns a dict with 'expiring_documents' (due within 30 days, days
+        left precomputed), 'ending_trials' ((trial, days_left) pairs within
+        7 days), 'active_events' (planning first, then in progress) and
+        'spending_summary'.
+        """
+        today = today or date.today()
+        statuses = ("planning", "in_progress")
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+
+            cursor.execute(
+                _Q_GET_EXPIRING_DOCS, (_to_day(today), self.user_id, _to_day(today + timedelta(days=30)))
+            )
+            documents = []
+            for row in cursor.fetchall():
+                document = self._row_to_document(row[:-1])
+                document._days_left = row[-1]
+                documents.append(document)
+
+            cursor.execute(
+                _Q_GET_ENDING_TRIALS, (_to_day(today), self.user_id, _to_day(today + timedelta(days=7)))
+            )
+            trials = [(self._row_to_subscription(row[:-1]), row[-1]) for row in cursor.fetchall()]
+
+            cursor.execute(
+                _q_get_events_by_statuses(len(statuses)), (self.user_id, *statuses, *statuses)
+            )
+            events = [self._row_to_life_event(row) for row in cursor.fetchall()]
+
+            cursor.execute(_Q_GET_SUBS_ACTIVE, (self.user_id,))
+            subscriptions = [self._row_to_subscription(row) for row in cursor.fetchall()]
+
+        return {
+            "expiring_documents": documents,
+            "ending_trials": trials,
+            "active_events": events,
+            "spending_summary": self._summarize_spending(subscriptions),
+        }
+
     def _row_to_life_event(self, row) -> LifeEvent:
         """Convert a database row to a LifeEvent object."""
-        import json
+        (event_id, event_type, title, target_date, checklist_json,
+         status, notes, created_at) = row
         
         # Parse checklist items from JSON
-        checklist_data = json.loads(row["checklist_items"]) if row["checklist_items"] else []
+        checklist_data = json.loads(checklist_json) if checklist_json else []
         checklist_items = []
+        completed_count = 0
         
-        for i, item in enumerate(checklist_data):
-            checklist_items.append(ChecklistItem(
-                id=item.get("id", f"item_{i}"),
-                title=item["title"],
-                description=item.get("description", ""),
-                is_completed=item.get("is_completed", False),
-                category=item.get("category", ""),
-                order=item.get("order", i),
-                completed_at=datetime.fromisoformat(item["completed_at"]) if item.get("completed_at") else None
-            ))
+        for i, data in enumerate(checklist_data):
+            item = object.__new__(ChecklistItem)
+            item.id = data.get("id", f"item_{i}")
+            item.title = data["title"]
+            item.description = data.get("description", "")
+            item.is_completed = data.get("is_completed", False)
+            completed_count += bool(item.is_completed)
+            item.category = sys.intern(str(data.get("category") or ""))
+            item.order = data.get("order", i)
+            item.completed_at = datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None
+            checklist_items.append(item)
         
-        return LifeEvent(
-            id=row["id"],
-            event_type=row["event_type"],
-            title=row["title"],
-            target_date=date.fromisoformat(row["target_date"]),
-            checklist_items=checklist_items,
-            status=row["status"] if row["status"] else "planning",
-            notes=row["notes"] if row["notes"] else "",
-            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.now()
-        )
+        event = object.__new__(LifeEvent)
+        event.id = event_id
+        event.event_type = sys.intern(event_type)
+        event.title = title
+        event.target_date = _from_day(target_date)
+        event.checklist_items = checklist_items
+        event._completed_count = completed_count
+        event.status = status if status else "planning"
+        event.notes = notes if notes else ""
+        event.created_at = _from_micros(created_at) or datetime.now()
+        return event
         
     def delete_life_event(self, event_id: str) -> bool:
         """Delete a life event by ID (only if owned by current user)."""
-        with self._get_connection() as conn:
+        with self._get_connection(write=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM life_events WHERE id = ? AND user_id = ?", (event_id, self.user_id))
+            cursor.execute(_Q_DELETE_EVENT, (event_id, self.user_id))
             return cursor.rowcount > 0
\ No newline at end of file
@@ -5,14 +5,21 @@ Enables long-term memory across conversation sessions.
 
 import json
 import sqlite3
-from datetime import datetime
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterable, List, Dict, Any
 from dataclasses import dataclass, asdict
 from contextlib import contextmanager
 
 
-@dataclass
+_uuid4 = uuid.uuid4
+
+
+@dataclass(slots=True)
 class MemoryEntry:
     """A single memory entry."""
     id: str
@@ -26,6 +33,11 @@ class MemoryEntry:
     access_count: int = 0
 
 
+_MEMORY_COLUMNS = (
+    "id, user_id, memory_type, content, metadata, importance, created_at, last_accessed, access_count"
+)
+
+
 class MemoryStore:
     """
     Persistent memory store for maintaining context across sessions.
@@ -37,10 +49,104 @@ class MemoryStore:
     - summary: Session summaries
     """
     
+    # Deferred access-count updates are written back after this many reads
+    ACCESS_FLUSH_INTERVAL = 20
+    
+    # Bounds for cached read results; the TTL also picks up writes made by
+    # other processes sharing the database file
+    CACHE_MAX_ENTRIES = 128
+    CACHE_TTL_SECONDS = 30
+    
     def __init__(self, db_path: str = "data/memory.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
+        
+        # One store may serve several sessions' agents on different threads;
+        # this lock guards the read cache and the deferred access queue below.
+        self._lock = threading.Lock()
+        
+        # get_memories results, keyed by query and tagged with the write
+        # version and time they were read at; any write bumps the version.
+        self._write_version = 0
+        self._mem_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+        # memory id -> (pending access count, last accessed timestamp)
+        self._pending_access: Dict[str, tuple] = {}
+        self._reads_since_flush = 0
+    
+    def _invalidate_cache(self):
+        """Mark cached get_memories results as stale after a write."""
+        with self._lock:
+            self._write_version += 1
+            self._mem_cache.clear()
+    
+    def _cache_get(self, key: tuple):
+        """Return a cached result that is current and fresh, or None."""
+        with self._lock:
+            cached = self._mem_cache.get(key)
+            if cached is None:
+                return None
+            version, stored_at, value = cached
+            if version != self._write_version or time.monotonic() - stored_at > self.CACHE_TTL_SECONDS:
+                del self._mem_cache[key]
+                return None
+            self._mem_cache.move_to_end(key)
+            return value
+    
+    def _cache_put(self, key: tuple, value, version: int):
+        """
+        Cache a read result taken at write version, evicting the least
+        recently used entry when full. Results read before a concurrent
+        write (an older version) are dropped rather than cached.
+        """
+        with self._lock:
+            if version != self._write_version:
+                return
+            self._mem_cache[key] = (version, time.monotonic(), value)
+            self._mem_cache.move_to_end(key)
+            if len(self._mem_cache) > self.CACHE_MAX_ENTRIES:
+                self._mem_cache.popitem(last=False)
+    
+    def _record_access(self, memory_ids: List[str]):
+        """Queue access-count updates and flush them every few reads."""
+        now = datetime.now().isoformat()
+        with self._lock:
+            for memory_id in memory_ids:
+                count, _ = self._pending_access.get(memory_id, (0, now))
+                self._pending_access[memory_id] = (count + 1, now)
+            
+            self._reads_since_flush += 1
+            should_flush = self._reads_since_flush >= self.ACCESS_FLUSH_INTERVAL
+        
+        if should_flush:
+            self.flush_access_updates()
+    
+    def _discard_pending_access(self, memory_ids: Iterable[str]):
+        """Drop queued access updates for deleted memories."""
+        with self._lock:
+            for memory_id in memory_ids:
+                self._pending_access.pop(memory_id, None)
+    
+    def flush_access_updates(self):
+        """Write queued access counts and timestamps back to the database."""
+        with self._lock:
+            self._reads_since_flush = 0
+            if not self._pending_access:
+                return
+            pending, self._pending_access = self._pending_access, {}
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+            UPDATE memories 
+            SET last_accessed = ?, access_count = access_count + ?
+            WHERE id = ?
+            """, [(last_accessed, count, memory_id) for memory_id, (count, last_accessed) in pending.items()])
+    
+    def close(self):
+        """Flush pending access updates. Call when the store is no longer needed."""
+        self.flush_access_updates()
     
     @contextmanager
     def _get_connection(self):
@@ -61,6 +167,9 @@ class MemoryStore:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL lets readers run alongside a writer instead of blocking on it
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Long-term memory table
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS memories (
@@ -107,11 +216,9 @@ class MemoryStore:
         importance: float = 0.5
     ) -> MemoryEntry:
         """Add a new memory entry."""
-        import uuid
-        
         now = datetime.now().isoformat()
         memory = MemoryEntry(
-            id=str(uuid.uuid4()),
+            id=str(_uuid4()),
             user_id=user_id,
             memory_type=memory_type,
             content=content,
@@ -122,13 +229,19 @@ class MemoryStore:
             access_count=0
         )
         
+        self.save_memories([memory])
+        return memory
+    
+    def save_memories(self, memories: Iterable[MemoryEntry]) -> List[MemoryEntry]:
+        """Insert several memory entries in a single transaction."""
+        memories = list(memories)
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.executemany("""
             INSERT INTO memories 
             (id, user_id, memory_type, content, metadata, importance, created_at, last_accessed, access_count)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            """, ((
                 memory.id,
                 memory.user_id,
                 memory.memory_type,
@@ -138,9 +251,10 @@ class MemoryStore:
                 memory.created_at,
                 memory.last_accessed,
                 memory.access_count
-            ))
+            ) for memory in memories))
         
-        return memory
+        self._invalidate_cache()
+        return memories
     
     def get_memories(
         self,
@@ -150,73 +264,157 @@ class MemoryStore:
         min_importance: float = 0.0
     ) -> List[MemoryEntry]:
         """Retrieve memories for a user."""
+        cache_key = (user_id, memory_type, limit, min_importance)
+        memories = self._cache_get(cache_key)
+        if memories is not None:
+            self._record_access([m.id for m in memories])
+            return list(memories)
+        
+        version = self._write_version
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
             if memory_type:
-                cursor.execute("""
-                SELECT * FROM memories 
+                cursor.execute(f"""
+                SELECT {_MEMORY_COLUMNS} FROM memories 
                 WHERE user_id = ? AND memory_type = ? AND importance >= ?
                 ORDER BY importance DESC, last_accessed DESC
                 LIMIT ?
                 """, (user_id, memory_type, min_importance, limit))
             else:
-                cursor.execute("""
-                SELECT * FROM memories 
+                cursor.execute(f"""
+                SELECT {_MEMORY_COLUMNS} FROM memories 
                 WHERE user_id = ? AND importance >= ?
                 ORDER BY importance DESC, last_accessed DESC
                 LIMIT ?
                 """, (user_id, min_importance, limit))
             
-            memories = []
-            for row in cursor.fetchall():
-                memories.append(MemoryEntry(
-                    id=row["id"],
-                    user_id=row["user_id"],
-                    memory_type=row["memory_type"],
-                    content=row["content"],
-                    metadata=json.loads(row["metadata"]) if row["metadata"] else {},
-                    importance=row["importance"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                    access_count=row["access_count"]
-                ))
+            memories = [self._row_to_memory(row) for row in cursor.fetchall()]
+        
+        self._cache_put(cache_key, memories, version)
+        
+        # Update access timestamps
+        if memories:
+            self._record_access([m.id for m in memories])
+        
+        return list(memories)
+    
+    def get_memories_by_types(self, user_id: str, limits: Dict[str, int]) -> Dict[str, List[MemoryEntry]]:
+        """
+        Retrieve the top memories of several types in one query.
+        limits maps memory_type to how many entries to return for it.
+        """
+        cache_key = ("by_types", user_id, tuple(sorted(limits.items())))
+        grouped = self._cache_get(cache_key)
+        if grouped is None:
+            version = self._write_version
+            types = list(limits)
+            rank_filter = " OR ".join("(memory_type = ? AND rank <= ?)" for _ in types)
+            params: List[Any] = [user_id, *types]
+            for memory_type in types:
+                params.extend((memory_type, limits[memory_type]))
             
-            # Update access timestamps
-            if memories:
-                memory_ids = [m.id for m in memories]
-                placeholders = ",".join(["?" for _ in memory_ids])
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
                 cursor.execute(f"""
-                UPDATE memories 
-                SET last_accessed = ?, access_count = access_count + 1
-                WHERE id IN ({placeholders})
-                """, [datetime.now().isoformat()] + memory_ids)
+                SELECT {_MEMORY_COLUMNS} FROM (
+                    SELECT {_MEMORY_COLUMNS}, ROW_NUMBER() OVER (
+                        PARTITION BY memory_type
+                        ORDER BY importance DESC, last_accessed DESC
+                    ) AS rank
+                    FROM memories
+                    WHERE user_id = ? AND memory_type IN ({", ".join("?" * len(types))})
+                )
+                WHERE {rank_filter}
+                ORDER BY memory_type, rank
+                """, params)
+                
+                grouped = {memory_type: [] for memory_type in types}
+                for row in cursor.fetchall():
+                    memory = self._row_to_memory(row)
+                    grouped[memory.memory_type].append(memory)
             
-            return memories
+            self._cache_put(cache_key, grouped, version)
+        
+        memory_ids = [m.id for memories in grouped.values() for m in memories]
+        if memory_ids:
+            self._record_access(memory_ids)
+        
+        return {memory_type: list(memories) for memory_type, memories in grouped.items()}
+    
+    @staticmethod
+    def _row_to_memory(row) -> MemoryEntry:
+        """Convert a memories row (in _MEMORY_COLUMNS order) to a MemoryEntry."""
+        (memory_id, user_id, memory_type, content, metadata,
+         importance, created_at, last_accessed, access_count) = row
+        memory = object.__new__(MemoryEntry)
+        memory.id = memory_id
+        memory.user_id = user_id
+        memory.memory_type = memory_type
+        memory.content = content
+        memory.metadata = json.loads(metadata) if metadata else {}
+        memory.importance = importance
+        memory.created_at = created_at
+        memory.last_accessed = last_accessed
+        memory.access_count = access_count
+        return memory
     
     def get_relevant_context(self, user_id: str, query: str, limit: int = 5) -> str:
         """Get relevant memories formatted as context for the agent."""
-        # Get high-importance facts and preferences
-        facts = self.get_memories(user_id, "fact", limit=limit, min_importance=0.3)
-        prefs = self.get_memories(user_id, "preference", limit=3, min_importance=0.5)
+        # High-importance facts and preferences plus the most recent session
+        # summary, fetched in a single statement and partitioned below.
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT memory_type, id, content, rank FROM (
+                SELECT memory_type, id, content, ROW_NUMBER() OVER (
+                    PARTITION BY memory_type
+                    ORDER BY importance DESC, last_accessed DESC
+                ) AS rank
+                FROM memories
+                WHERE user_id = ? AND (
+                    (memory_type = 'fact' AND importance >= 0.3) OR
+                    (memory_type = 'preference' AND importance >= 0.5)
+                )
+            )
+            WHERE (memory_type = 'fact' AND rank <= ?) OR (memory_type = 'preference' AND rank <= 3)
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'summary', NULL, summary, 1 FROM session_summaries
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+                LIMIT 1
+            )
+            ORDER BY memory_type, rank
+            """, (user_id, limit, user_id))
+            
+            grouped: Dict[str, List[str]] = {"fact": [], "preference": [], "summary": []}
+            memory_ids = []
+            for memory_type, memory_id, content, _ in cursor.fetchall():
+                grouped[memory_type].append(content)
+                if memory_id is not None:
+                    memory_ids.append(memory_id)
         
-        # Get most recent session summary
-        summaries = self._get_recent_summaries(user_id, limit=1)
+        # Update access timestamps, as get_memories does
+        if memory_ids:
+            self._record_access(memory_ids)
+        
+        facts, prefs, summaries = grouped["fact"], grouped["preference"], grouped["summary"]
         
         context_parts = []
         
         if facts:
             context_parts.append("**Known facts about user:**")
             for f in facts:
-                context_parts.append(f"- {f.content}")
+                context_parts.append(f"- {f}")
         
         if prefs:
             context_parts.append("\n**User preferences:**")
             for p in prefs:
-                context_parts.append(f"- {p.content}")
+                context_parts.append(f"- {p}")
         
         if summaries:
-            context_parts.append(f"\n**Last session summary:** {summaries[0]['summary']}")
+            context_parts.append(f"\n**Last session summary:** {summaries[0]}")
         
         return "\n".join(context_parts) if context_parts else ""
     
@@ -228,8 +426,6 @@ class MemoryStore:
         actions_taken: List[str]
     ) -> None:
         """Save a session summary for long-term context."""
-        import uuid
-        
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -237,7 +433,7 @@ class MemoryStore:
             (id, user_id, summary, key_topics, actions_taken, created_at)
             VALUES (?, ?, ?, ?, ?, ?)
             """, (
-                str(uuid.uuid4()),
+                str(_uuid4()),
                 user_id,
                 summary,
                 json.dumps(key_topics),
@@ -265,21 +461,57 @@ class MemoryStore:
             cursor.execute("""
             UPDATE memories SET importance = ? WHERE id = ?
             """, (min(max(importance, 0.0), 1.0), memory_id))
-            return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+        
+        self._invalidate_cache()
+        return updated
+    
+    def find_memories_containing(self, user_id: str, substring: str) -> List[Dict]:
+        """Find a user's memories whose content contains substring (case-insensitive)."""
+        with self._get_connection() as conn:
+            # SQLite's lower() only folds ASCII; use Python's to match str.lower()
+            conn.create_function("py_lower", 1, str.lower, deterministic=True)
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT id, content FROM memories
+            WHERE user_id = ? AND instr(py_lower(content), ?) > 0
+            """, (user_id, substring.lower()))
+            
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def delete_memories(self, memory_ids: List[str]) -> int:
+        """Delete several memory entries in one statement. Returns the number removed."""
+        if not memory_ids:
+            return 0
+        
+        placeholders = ", ".join("?" * len(memory_ids))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DELETE FROM memories WHERE id IN ({placeholders})", memory_ids)
+            deleted = cursor.rowcount
+        
+        self._discard_pending_access(memory_ids)
+        self._invalidate_cache()
+        return deleted
     
     def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory entry."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        
+        self._discard_pending_access((memory_id,))
+        self._invalidate_cache()
+        return deleted
     
     def cleanup_old_memories(self, user_id: str, days_old: int = 90, keep_important: bool = True):
         """Remove old, low-importance memories."""
-        from datetime import timedelta
-        
         cutoff = (datetime.now() - timedelta(days=days_old)).isoformat()
         
+        # Make sure recent reads are counted before judging staleness
+        self.flush_access_updates()
+        
         with self._get_connection() as conn:
             cursor = conn.cursor()
             if keep_important:
@@ -292,5 +524,7 @@ class MemoryStore:
                 DELETE FROM memories 
                 WHERE user_id = ? AND last_accessed < ?
                 """, (user_id, cutoff))
-            
-            return cursor.rowcount
+            deleted = cursor.rowcount
+        
+        self._invalidate_cache()
+        return deleted
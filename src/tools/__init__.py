@@ -44,7 +44,7 @@ from .memory_tools import (
     set_memory_context
 )
 
-# Combined tools list - includes memory tools for persistent context
+# Combined tools tuple - includes memory tools for persistent context
 ALL_TOOLS = DOCUMENT_TOOLS + SUBSCRIPTION_TOOLS + CHECKLIST_TOOLS + NOTIFICATION_TOOLS + MEMORY_TOOLS
 
 __all__ = [
@@ -3,11 +3,23 @@ Life Event checklist tools for the Life Admin Assistant.
 Track major life events with step-by-step checklists.
 """
 
-from datetime import date, datetime
-from typing import Annotated, Optional, List
+from collections import defaultdict
+from datetime import date
+from difflib import SequenceMatcher
+from functools import lru_cache
+import io
+from itertools import chain
+from types import MappingProxyType
+from typing import Annotated, Mapping, Optional, List
 import json
 from pathlib import Path
 
+try:
+    # orjson raises a json.JSONDecodeError subclass, so callers catch the same error
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from ..database.repository.repository import Repository
 from ..database.models.LifeEvent import LifeEvent, ChecklistItem
 
@@ -34,7 +46,7 @@ def set_repository(repo: Repository):
 # CHECKLIST TEMPLATES - Pre-defined checklists for common events
 # ============================================================
 
-CHECKLIST_TEMPLATES = {
+_TEMPLATE_DEFINITIONS = {
     "moving": {
         "title": "Moving Checklist",
         "items": [
@@ -157,16 +169,47 @@ CHECKLIST_TEMPLATES = {
     }
 }
 
+# Read-only view of the templates, frozen once at import so callers share it
+# safely and nothing can mutate a template between events.
+CHECKLIST_TEMPLATES: Mapping[str, Mapping] = MappingProxyType({
+    event_type: MappingProxyType({
+        "title": template["title"],
+        "items": tuple(MappingProxyType(item) for item in template["items"]),
+    })
+    for event_type, template in _TEMPLATE_DEFINITIONS.items()
+})
+
+# Template items flattened to (title, category) pairs so start_life_event can
+# build a checklist without per-item dict lookups.
+_COMPILED_TEMPLATES: Mapping[str, tuple] = MappingProxyType({
+    event_type: tuple((item["title"], item.get("category", "")) for item in template["items"])
+    for event_type, template in _TEMPLATE_DEFINITIONS.items()
+})
+
 
 # ============================================================
 # TOOL FUNCTIONS
 # ============================================================
 
-def get_available_events() -> str:
-    """
-    List all supported life event types with descriptions.
-    Call this to see what checklists are available.
-    """
+# Indexed by ChecklistItem.is_completed
+_CHECK_MARKS = ("⬜", "✅")
+
+_STATUS_EMOJI: Mapping[str, str] = MappingProxyType({
+    "planning": "📝",
+    "in_progress": "🔄",
+    "completed": "✅",
+    "cancelled": "❌",
+})
+
+
+@lru_cache(maxsize=128)
+def _category_display(category: str) -> str:
+    """Turn a category key like 'first_week' into 'First Week'."""
+    return category.replace("_", " ").title()
+
+
+def _build_available_events_string() -> str:
+    """Render the available-events listing from the templates."""
     lines = ["📋 **Available Life Event Checklists**\n"]
     
     event_descriptions = {
@@ -188,6 +231,18 @@ def get_available_events() -> str:
     return "\n".join(lines)
 
 
+# Templates are fixed at import, so the listing is rendered once
+_AVAILABLE_EVENTS_STR = _build_available_events_string()
+
+
+def get_available_events() -> str:
+    """
+    List all supported life event types with descriptions.
+    Call this to see what checklists are available.
+    """
+    return _AVAILABLE_EVENTS_STR
+
+
 def start_life_event(
     event_type: Annotated[str, "Type of event: 'moving', 'new_job', 'buying_car', 'buying_home', 'getting_married', 'travel'"],
     title: Annotated[str, "Custom title for this event (e.g., 'Moving to NYC')"],
@@ -213,12 +268,10 @@ def start_life_event(
             available = ", ".join(CHECKLIST_TEMPLATES.keys())
             return f"❌ Unknown event type '{event_type}'. Available: {available}"
         
-        template = CHECKLIST_TEMPLATES[event_type_lower]
-        
         # For custom events with provided tasks
         if event_type_lower == "custom" and custom_tasks_json:
             try:
-                tasks_data = json.loads(custom_tasks_json)
+                tasks_data = _json_loads(custom_tasks_json)
                 checklist_items = [
                     ChecklistItem(
                         id=f"item_{i}",
@@ -232,17 +285,14 @@ def start_life_event(
                 ]
             except json.JSONDecodeError:
                 return "❌ Invalid JSON format for custom tasks."
+        elif event_type_lower == "custom":
+            # Empty custom checklist; tasks are added later
+            checklist_items = []
         else:
             # Use template items
             checklist_items = [
-                ChecklistItem(
-                    id=f"item_{i}",
-                    title=item["title"],
-                    category=item.get("category", ""),
-                    order=i,
-                    is_completed=False
-                )
-                for i, item in enumerate(template["items"])
+                ChecklistItem(id=f"item_{i}", title=t, category=c, order=i, is_completed=False)
+                for i, (t, c) in enumerate(_COMPILED_TEMPLATES[event_type_lower])
             ]
         
         # Create the life event
@@ -292,42 +342,39 @@ def get_checklist(
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events(status="planning") + repo.get_life_events(status="in_progress")
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type.lower()]
+        events = repo.iter_active_life_events(event_type.lower() if event_type else None)
+        first = next(events, None)
         
-        if not events:
+        if first is None:
             return "📭 No active life events. Start one by telling me about a major event you're planning!"
         
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
+        today = date.today()
         
-        for event in events:
-            completed, total = event.get_progress()
-            pct = event.get_progress_percentage()
-            days = (event.target_date - date.today()).days
+        for event in chain((first,), events):
+            completed, total, pct = event.progress_summary()
+            days = (event.target_date - today).days
             
-            lines.append(f"📋 **{event.title}**")
-            lines.append(f"📅 Target: {event.target_date.strftime('%B %d, %Y')} ({days} days)")
-            lines.append(f"📊 Progress: {completed}/{total} tasks ({pct:.0f}%)\n")
+            write(
+                f"📋 **{event.title}**\n"
+                f"📅 Target: {event.target_date.strftime('%B %d, %Y')} ({days} days)\n"
+                f"📊 Progress: {completed}/{total} tasks ({pct:.0f}%)\n\n"
+            )
             
             # Group by category
-            categories = {}
+            categories = defaultdict(list)
             for item in event.checklist_items:
-                cat = item.category or "other"
-                if cat not in categories:
-                    categories[cat] = []
-                categories[cat].append(item)
+                categories[item.category or "other"].append(item)
             
             for cat, items in categories.items():
-                cat_display = cat.replace("_", " ").title()
-                lines.append(f"**{cat_display}:**")
+                write(f"**{_category_display(cat)}:**\n")
                 for item in items:
-                    status = "✅" if item.is_completed else "⬜"
-                    lines.append(f"  {status} {item.title}")
-                lines.append("")
+                    write(f"  {_CHECK_MARKS[item.is_completed]} {item.title}\n")
+                write("\n")
         
-        return "\n".join(lines)
+        # Drop the final newline so output matches a "\n".join of the lines
+        return buf.getvalue()[:-1]
         
     except Exception as e:
         return f"❌ Error retrieving checklist: {str(e)}"
@@ -342,35 +389,28 @@ def mark_task_complete(
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events(status="planning") + repo.get_life_events(status="in_progress")
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type.lower()]
+        events = repo.get_active_life_events(event_type.lower() if event_type else None)
         
         if not events:
             return "❌ No active life events found."
         
         # Search for matching task
+        query = task_title.lower()
         for event in events:
             for item in event.checklist_items:
-                if task_title.lower() in item.title.lower():
+                if query in item.title.lower():
                     if item.is_completed:
                         return f"ℹ️ '{item.title}' is already completed!"
                     
-                    item.is_completed = True
-                    item.completed_at = datetime.now()
-                    event.status = "in_progress"
+                    event.complete_item(item)
+                    completed, total, pct = event.progress_summary()
+                    event.status = "completed" if completed == total else "in_progress"
                     repo.save_life_event(event)
                     
-                    completed, total = event.get_progress()
-                    pct = event.get_progress_percentage()
-                    
                     response = f"✅ Marked complete: **{item.title}**\n"
                     response += f"📊 Progress: {completed}/{total} ({pct:.0f}%)"
                     
                     if completed == total:
-                        event.status = "completed"
-                        repo.save_life_event(event)
                         response += "\n\n🎉 **Congratulations! All tasks completed!**"
                     
                     return response
@@ -387,30 +427,30 @@ def list_life_events() -> str:
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events()
+        events = repo.iter_life_events()
+        first = next(events, None)
         
-        if not events:
+        if first is None:
             return "📭 No life events being tracked. Tell me about a major event you're planning!"
         
-        lines = ["📋 **Your Life Events**\n"]
+        buf = io.StringIO()
+        write = buf.write
+        write("📋 **Your Life Events**\n\n")
+        today = date.today()
         
-        for event in events:
-            completed, total = event.get_progress()
-            pct = event.get_progress_percentage()
-            days = (event.target_date - date.today()).days
+        for event in chain((first,), events):
+            completed, total, pct = event.progress_summary()
+            days = (event.target_date - today).days
             
-            status_emoji = {
-                "planning": "📝",
-                "in_progress": "🔄",
-                "completed": "✅",
-                "cancelled": "❌"
-            }.get(event.status, "📋")
+            status_emoji = _STATUS_EMOJI.get(event.status, "📋")
             
-            lines.append(f"{status_emoji} **{event.title}** ({event.event_type})")
-            lines.append(f"   📅 {event.target_date.strftime('%b %d, %Y')} ({days} days)")
-            lines.append(f"   📊 {completed}/{total} tasks ({pct:.0f}%)\n")
+            write(
+                f"{status_emoji} **{event.title}** ({event.event_type})\n"
+                f"   📅 {event.target_date.strftime('%b %d, %Y')} ({days} days)\n"
+                f"   📊 {completed}/{total} tasks ({pct:.0f}%)\n\n"
+            )
         
-        return "\n".join(lines)
+        return buf.getvalue()[:-1]
         
     except Exception as e:
         return f"❌ Error listing events: {str(e)}"
@@ -424,10 +464,9 @@ def delete_life_event(
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events()
         
         # Find matching event
-        matching = [e for e in events if e.event_type.lower() == event_type.lower()]
+        matching = repo.get_life_events_by_type(event_type.lower())
         
         if not matching:
             return f"❌ No '{event_type}' life event found."
@@ -458,20 +497,13 @@ def add_task_to_checklist(
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events()
         
         # Find matching event by type or title
-        matching = [
-            e for e in events 
-            if event_identifier.lower() in e.event_type.lower() 
-            or event_identifier.lower() in e.title.lower()
-        ]
+        event = repo.find_life_event(event_identifier)
         
-        if not matching:
+        if not event:
             return f"❌ No event found matching '{event_identifier}'. Use 'list my life events' to see all."
         
-        event = matching[0]
-        
         # Create new task
         new_task = ChecklistItem(
             id=f"item_{len(event.checklist_items)}",
@@ -482,7 +514,7 @@ def add_task_to_checklist(
             is_completed=False
         )
         
-        event.checklist_items.append(new_task)
+        event.append_item(new_task)
         repo.save_life_event(event)
         
         return (
@@ -505,36 +537,26 @@ def remove_task_from_checklist(
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events()
         
         # Find event
-        matching_events = [
-            e for e in events 
-            if event_identifier.lower() in e.event_type.lower() 
-            or event_identifier.lower() in e.title.lower()
-        ]
+        event = repo.find_life_event(event_identifier)
         
-        if not matching_events:
+        if not event:
             return f"❌ No event found matching '{event_identifier}'."
         
-        event = matching_events[0]
-        
         # Find task to remove
-        task_to_remove = None
-        for task in event.checklist_items:
-            if task_identifier.lower() in task.title.lower():
-                task_to_remove = task
+        remove_index = None
+        query = task_identifier.lower()
+        for i, task in enumerate(event.checklist_items):
+            if query in task.title.lower():
+                remove_index = i
                 break
         
-        if not task_to_remove:
+        if remove_index is None:
             return f"❌ No task found matching '{task_identifier}' in '{event.title}'."
         
-        # Remove task
-        event.checklist_items.remove(task_to_remove)
-        
-        # Reorder remaining tasks
-        for i, task in enumerate(event.checklist_items):
-            task.order = i
+        # Remove task; later tasks are renumbered
+        task_to_remove = event.remove_item_at(remove_index)
         
         repo.save_life_event(event)
         
@@ -561,24 +583,18 @@ def update_task_in_checklist(
     """
     try:
         repo = get_repository()
-        events = repo.get_life_events()
         
         # Find event
-        matching_events = [
-            e for e in events 
-            if event_identifier.lower() in e.event_type.lower() 
-            or event_identifier.lower() in e.title.lower()
-        ]
+        event = repo.find_life_event(event_identifier)
         
-        if not matching_events:
+        if not event:
             return f"❌ No event found matching '{event_identifier}'."
         
-        event = matching_events[0]
-        
         # Find task to update
         task_to_update = None
+        query = task_identifier.lower()
         for task in event.checklist_items:
-            if task_identifier.lower() in task.title.lower():
+            if query in task.title.lower():
                 task_to_update = task
                 break
         
@@ -620,43 +636,35 @@ def replace_entire_checklist(
     ]
     """
     try:
-        import json
-        
         repo = get_repository()
-        events = repo.get_life_events()
         
         # Find event
-        matching_events = [
-            e for e in events 
-            if event_identifier.lower() in e.event_type.lower() 
-            or event_identifier.lower() in e.title.lower()
-        ]
+        event = repo.find_life_event(event_identifier)
         
-        if not matching_events:
+        if not event:
             return f"❌ No event found matching '{event_identifier}'."
         
-        event = matching_events[0]
-        
         # Parse new tasks
         try:
-            new_tasks_data = json.loads(tasks_json)
+            new_tasks_data = _json_loads(tasks_json)
         except json.JSONDecodeError:
             return "❌ Invalid JSON format for tasks."
         
         # Create new checklist items
-        new_checklist = []
-        for i, task_data in enumerate(new_tasks_data):
-            new_checklist.append(ChecklistItem(
+        new_checklist = [
+            ChecklistItem(
                 id=f"item_{i}",
                 title=task_data.get("title", "Untitled task"),
                 description=task_data.get("description", ""),
                 category=task_data.get("category", "general"),
                 order=i,
                 is_completed=False
-            ))
+            )
+            for i, task_data in enumerate(new_tasks_data)
+        ]
         
         # Replace checklist
-        event.checklist_items = new_checklist
+        event.replace_items(new_checklist)
         repo.save_life_event(event)
         
         return (
@@ -670,13 +678,16 @@ def replace_entire_checklist(
 
 def find_similar_events(query: str) -> list:
     """Find events with similar names using fuzzy matching."""
-    from difflib import SequenceMatcher
-    
-    events = _checklist_repo.get_life_events()
+    events = get_repository().get_life_events()
     similar = []
+    matcher = SequenceMatcher(None, query.lower())
     
     for event in events:
-        ratio = SequenceMatcher(None, query.lower(), event.title.lower()).ratio()
+        matcher.set_seq2(event.title.lower())
+        # Cheap upper bounds first; only run the full match when they can pass
+        if matcher.real_quick_ratio() <= 0.5 or matcher.quick_ratio() <= 0.5:
+            continue
+        ratio = matcher.ratio()
         if ratio > 0.5:  # 50% similarity threshold
             similar.append({"event": event, "similarity": ratio})
     
@@ -691,16 +702,11 @@ def update_life_event_title(
     Update the title of an existing life event.
     Use this when the user wants to rename a life event or fix a typo.
     """
-    repo = get_checklist_repository()
+    repo = get_repository()
     
     try:
         # Find the event
-        events = repo.get_life_events()
-        event = None
-        for e in events:
-            if e.id == event_id:
-                event = e
-                break
+        event = repo.get_life_event(event_id)
         
         if not event:
             return f"❌ Life event with ID '{event_id}' not found."
@@ -723,7 +729,7 @@ def update_life_event_title(
 # EXPORT
 # ============================================================
 
-CHECKLIST_TOOLS = [
+CHECKLIST_TOOLS = (
     get_available_events,
     start_life_event,
     get_checklist,
@@ -736,4 +742,4 @@ CHECKLIST_TOOLS = [
     replace_entire_checklist,
     find_similar_events,
     update_life_event_title,
-]
\ No newline at end of file
+)
\ No newline at end of file
@@ -3,6 +3,7 @@ Document tracking tools for the Life Admin Assistant.
 These functions are called by the AI agent to manage user documents.
 """
 
+from bisect import bisect_right
 from datetime import date, datetime
 from typing import Annotated, Optional, List
 
@@ -28,6 +29,13 @@ def set_repository(repo: Repository):
     _repository = repo
 
 
+# Lower bounds (in days left) of the urgent, warning and upcoming buckets;
+# anything below the first is expired.
+_URGENCY_THRESHOLDS = (0, 8, 31)
+
+_VALID_CATEGORIES = frozenset(Document.VALID_CATEGORIES)
+
+
 # =========================================================
 # TOOL FUNCTIONS - These are what the AI can call
 # =========================================================
@@ -47,17 +55,13 @@ def add_document(
     try:
         expiry = date.fromisoformat(expiry_date)
 
-        valid_categories = [
-            "identification", "insurance", "warranty", 
-            "medical", "financial", "vehicle", "property", "other"
-        ]
-
-        if category.lower() not in valid_categories:
+        category = category if category.islower() else category.lower()
+        if category not in _VALID_CATEGORIES:
             category = "other"
         
         document = Document(
             name=name,
-            category=category.lower(),
+            category=category,
             expiry_date=expiry,
             family_member=family_member or "self",
             notes=notes or ""
@@ -125,22 +129,14 @@ def get_expiring_documents(
         if not documents:
             return f"✅ No documents expiring in the next {days_ahead} days. You're all set!"
         
-        # Group by urgency
-        expired = []
-        urgent = []      # <= 7 days
-        warning = []     # <= 30 days
-        upcoming = []    # > 30 days
+        # Group by urgency: expired, urgent (<= 7 days), warning (<= 30 days), upcoming
+        buckets = ([], [], [], [])
         
         for doc in documents:
             days = doc.days_until_expiry()
-            if days < 0:
-                expired.append((doc, days))
-            elif days <= 7:
-                urgent.append((doc, days))
-            elif days <= 30:
-                warning.append((doc, days))
-            else:
-                upcoming.append((doc, days))
+            buckets[bisect_right(_URGENCY_THRESHOLDS, days)].append((doc, days))
+        
+        expired, urgent, warning, upcoming = buckets
         
         lines = [f"📋 **Documents Expiring Soon** (next {days_ahead} days)\n"]
         
@@ -181,15 +177,13 @@ def delete_document(
     """
     try:
         repo = get_repository()
-        documents = repo.get_documents()
         
         # Find document by name (case-insensitive)
-        matching = [d for d in documents if d.name.lower() == document_name.lower()]
+        doc = repo.get_document_by_name(document_name)
         
-        if not matching:
+        if not doc:
             return f"❌ Document '{document_name}' not found. Use 'list documents' to see all tracked documents."
         
-        doc = matching[0]
         repo.delete_document(doc.id)
         
         return f"✅ Deleted '{doc.name}' from tracking."
@@ -202,9 +196,9 @@ def delete_document(
 # EXPORT: Lost of tools the agent can use
 # ========================================================
 
-DOCUMENT_TOOLS = [
+DOCUMENT_TOOLS = (
     add_document,
     list_documents,
     get_expiring_documents,
     delete_document,
-]
\ No newline at end of file
+)
\ No newline at end of file
@@ -90,22 +90,20 @@ def recall_user_context(
         return "ℹ️ Memory is not enabled for this session."
     
     try:
-        facts = _memory_store.get_memories(_current_user_id, "fact", limit=10)
-        prefs = _memory_store.get_memories(_current_user_id, "preference", limit=5)
+        grouped = _memory_store.get_memories_by_types(_current_user_id, {"fact": 10, "preference": 5})
+        facts, prefs = grouped["fact"], grouped["preference"]
         
         lines = ["📝 **What I remember about you:**\n"]
         
         if facts:
             lines.append("**Facts:**")
-            for f in facts:
-                lines.append(f"• {f.content}")
+            lines.extend([f"• {f.content}" for f in facts])
         else:
             lines.append("No facts stored yet.")
         
         if prefs:
             lines.append("\n**Preferences:**")
-            for p in prefs:
-                lines.append(f"• {p.content}")
+            lines.extend([f"• {p.content}" for p in prefs])
         else:
             lines.append("\nNo preferences stored yet.")
         
@@ -126,16 +124,12 @@ def forget_memory(
     
     try:
         # Find matching memories
-        all_memories = _memory_store.get_memories(_current_user_id, limit=50)
-        matching = [m for m in all_memories if memory_content.lower() in m.content.lower()]
+        matching = _memory_store.find_memories_containing(_current_user_id, memory_content)
         
         if not matching:
             return f"❌ No memory found matching '{memory_content}'"
         
-        deleted_count = 0
-        for memory in matching:
-            if _memory_store.delete_memory(memory.id):
-                deleted_count += 1
+        deleted_count = _memory_store.delete_memories([m["id"] for m in matching])
         
         return f"✅ Removed {deleted_count} memory/memories related to '{memory_content}'"
     except Exception as e:
@@ -146,9 +140,9 @@ def forget_memory(
 # EXPORT
 # ============================================================
 
-MEMORY_TOOLS = [
+MEMORY_TOOLS = (
     remember_user_fact,
     remember_user_preference,
     recall_user_context,
     forget_memory
-]
+)
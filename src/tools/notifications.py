@@ -5,10 +5,15 @@ Send email reminders for expiring documents, ending trials, and upcoming events.
 
 import smtplib
 import logging
+from bisect import bisect_left
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import date, timedelta
-from typing import Annotated, Optional, List
+from functools import lru_cache
+from typing import Annotated, Callable, Dict, Optional, List, Tuple
 
 from ..database.repository.repository import Repository
 from ..config import get_secret
@@ -33,12 +38,74 @@ def set_repository(repo: Repository):
     _repository = repo
 
 
+# ============================================================
+# AGGREGATION CACHE
+# ============================================================
+
+# Reminder/digest aggregates, keyed on the repository's data version so any
+# write invalidates them; the TTL bounds staleness from other processes.
+_CACHE_TTL_SECONDS = 60
+_CACHE_MAX_ENTRIES = 32
+_aggregate_cache: Dict[tuple, Tuple[float, tuple]] = {}
+# Sessions run on separate threads; guards lookups, evictions and stores
+_aggregate_lock = threading.Lock()
+
+
+def _cached_aggregate(key: tuple, compute: Callable[[], tuple]) -> tuple:
+    """Return compute() for key, reusing a result younger than the TTL."""
+    now = time.monotonic()
+    with _aggregate_lock:
+        hit = _aggregate_cache.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    
+    # Computed outside the lock so a slow query doesn't hold up other sessions
+    value = compute()
+    with _aggregate_lock:
+        if key not in _aggregate_cache and len(_aggregate_cache) >= _CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            del _aggregate_cache[next(iter(_aggregate_cache))]
+        _aggregate_cache[key] = (now + _CACHE_TTL_SECONDS, value)
+    return value
+
+
+def _cache_key(repo: Repository, *parts) -> tuple:
+    return (repo.db_key, repo.user_id, repo.data_version) + parts
+
+
+def _collect_attention_items(repo: Repository, days_ahead: int) -> tuple:
+    """Split repo.get_attention_items() into (expiring_docs, ending_trials, upcoming_events)."""
+    sections = {"document": [], "trial": [], "event": []}
+    for kind, _, name, days, extra in repo.get_attention_items(days_ahead):
+        sections[kind].append((name, days, extra))
+    return sections["document"], sections["trial"], sections["event"]
+
+
+def _collect_digest_data(repo: Repository, today: date) -> tuple:
+    """Gather (urgent_docs, trials, upcoming_docs, events, spending_summary) for a digest.
+
+    Everything comes from repo.get_digest_payload(). Documents are split
+    into (name, days) rows for the next 7 days (including expired) and for
+    days 8-30. Trials are (name, days) rows for those ending within 7 days.
+    """
+    payload = repo.get_digest_payload(today)
+    urgent_docs, upcoming_docs = [], []
+    for doc in payload["expiring_documents"]:
+        days = doc.days_until_expiry()
+        (urgent_docs if days <= 7 else upcoming_docs).append((doc.name, days))
+    trials = [(trial.service_name, days) for trial, days in payload["ending_trials"]]
+    events = payload["active_events"]
+    summary = payload["spending_summary"]
+    return urgent_docs, trials, upcoming_docs, events, summary
+
+
 # ============================================================
 # EMAIL CONFIGURATION
 # ============================================================
 
+@lru_cache(maxsize=1)
 def _get_email_config() -> dict:
-    """Get email configuration from environment/secrets."""
+    """Get email configuration from environment/secrets (read once per process)."""
     return {
         "smtp_server": get_secret("SMTP_SERVER", "smtp.gmail.com"),
         "smtp_port": int(get_secret("SMTP_PORT", "587")),
@@ -48,40 +115,168 @@ def _get_email_config() -> dict:
     }
 
 
-def _send_email(subject: str, body: str, to_email: str = None) -> bool:
+def reload_email_config():
+    """Forget the cached email configuration so the next send re-reads secrets."""
+    _get_email_config.cache_clear()
+
+
+# Logged-in SMTP connection reused across sends, keyed by the settings it was
+# opened with. Guarded by _smtp_lock since Streamlit serves sessions on threads.
+_smtp_session: Optional[smtplib.SMTP] = None
+_smtp_session_key: Optional[tuple] = None
+_smtp_lock = threading.Lock()
+
+
+def _open_smtp_session(config: dict) -> smtplib.SMTP:
+    """Return a live, logged-in SMTP connection for config, reusing the last one if possible."""
+    global _smtp_session, _smtp_session_key
+    key = (config["smtp_server"], config["smtp_port"], config["sender_email"], config["sender_password"])
+    
+    if _smtp_session is not None and _smtp_session_key == key:
+        try:
+            if _smtp_session.noop()[0] == 250:
+                return _smtp_session
+        except smtplib.SMTPException:
+            pass
+    _close_smtp_session()
+    
+    server = smtplib.SMTP(config["smtp_server"], config["smtp_port"])
+    try:
+        server.starttls()
+        server.login(config["sender_email"], config["sender_password"])
+    except Exception:
+        server.close()
+        raise
+    _smtp_session, _smtp_session_key = server, key
+    return server
+
+
+def _close_smtp_session():
+    """Drop the cached SMTP connection."""
+    global _smtp_session, _smtp_session_key
+    if _smtp_session is not None:
+        try:
+            _smtp_session.quit()
+        except Exception:
+            _smtp_session.close()
+    _smtp_session, _smtp_session_key = None, None
+
+
+def _email_configured(config: dict) -> bool:
+    """Whether sender credentials are present, i.e. sending is worth attempting."""
+    return bool(config["sender_email"] and config["sender_password"])
+
+
+def _send_emails_batch(messages: List[Tuple[str, str, Optional[str]]]) -> List[bool]:
     """
-    Send an email notification.
-    Returns True if successful, False otherwise.
+    Send several (subject, body, to_email) emails over one SMTP connection.
+    Returns a success flag per message.
     """
     config = _get_email_config()
     
-    if not config["sender_email"] or not config["sender_password"]:
+    if not _email_configured(config):
         logger.warning("Email not configured. Set SENDER_EMAIL and SENDER_PASSWORD.")
-        return False
-    
-    recipient = to_email or config["recipient_email"]
-    if not recipient:
-        logger.warning("No recipient email configured.")
-        return False
-    
+        return [False] * len(messages)
+    
+    results = []
+    with _smtp_lock:
+        for subject, body, to_email in messages:
+            recipient = to_email or config["recipient_email"]
+            if not recipient:
+                logger.warning("No recipient email configured.")
+                results.append(False)
+                continue
+            
+            msg = MIMEMultipart()
+            msg["From"] = config["sender_email"]
+            msg["To"] = recipient
+            msg["Subject"] = subject
+            msg.attach(MIMEText(body, "html"))
+            
+            try:
+                try:
+                    _open_smtp_session(config).send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # Server dropped the idle connection between the check and the send
+                    _close_smtp_session()
+                    _open_smtp_session(config).send_message(msg)
+                
+                logger.info(f"Email sent successfully to {recipient}")
+                results.append(True)
+                
+            except Exception as e:
+                logger.error(f"Failed to send email: {e}")
+                _close_smtp_session()
+                results.append(False)
+    
+    return results
+
+
+def _send_email(subject: str, body: str, to_email: str = None) -> bool:
+    """
+    Send an email notification.
+    Returns True if successful, False otherwise.
+    """
+    return _send_emails_batch([(subject, body, to_email)])[0]
+
+
+# Background senders so tool calls don't wait on the TLS handshake and SMTP
+# round-trips; sends still go through _smtp_lock one at a time.
+_email_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="email")
+
+
+def _log_send_result(future: Future):
+    """Log the outcome of a queued email."""
     try:
-        msg = MIMEMultipart()
-        msg["From"] = config["sender_email"]
-        msg["To"] = recipient
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body, "html"))
-        
-        with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as server:
-            server.starttls()
-            server.login(config["sender_email"], config["sender_password"])
-            server.send_message(msg)
-        
-        logger.info(f"Email sent successfully to {recipient}")
-        return True
-        
+        if not future.result():
+            logger.warning("Queued email was not sent.")
     except Exception as e:
-        logger.error(f"Failed to send email: {e}")
-        return False
+        logger.error(f"Queued email failed: {e}")
+
+
+def _queue_email(subject: str, body: str, to_email: str = None) -> Future:
+    """
+    Send an email notification in the background.
+    Returns a Future resolving to the same success flag as _send_email.
+    """
+    future = _email_executor.submit(_send_email, subject, body, to_email)
+    future.add_done_callback(_log_send_result)
+    return future
+
+
+# ============================================================
+# EMAIL TEMPLATES
+# ============================================================
+
+_HTML_PRELUDE_TMPL = """
+    <html>
+    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #333;">🏠 Life Admin Assistant</h2>
+        <p>Here's your summary of items needing attention in the next {days} days:</p>
+    """
+# Urgency marker per expiring document: <= 7 days, <= 30 days, later
+_URGENCY_THRESHOLDS = (7, 30)
+_URGENCY_EMOJIS = ("🔴", "🟠", "🟡")
+_DOCS_HEADER = """
+        <h3 style="color: #d63031;">📄 Expiring Documents</h3>
+        <ul>
+        """
+_TRIALS_HEADER = """
+        <h3 style="color: #e17055;">💳 Free Trials Ending</h3>
+        <ul>
+        """
+_EVENTS_HEADER = """
+        <h3 style="color: #0984e3;">🎯 Upcoming Life Events</h3>
+        <ul>
+        """
+_HTML_FOOTER = """
+        <hr style="border: 1px solid #ddd;">
+        <p style="color: #666; font-size: 12px;">
+            Sent by Life Admin Assistant 🤖
+        </p>
+    </body>
+    </html>
+    """
 
 
 # ============================================================
@@ -114,7 +309,7 @@ def check_notification_status() -> str:
     
     lines.append(f"\n📮 SMTP Server: {config['smtp_server']}:{config['smtp_port']}")
     
-    if not config["sender_email"] or not config["sender_password"]:
+    if not _email_configured(config):
         lines.append("\n💡 **To enable notifications:**")
         lines.append("Add these to your .env file or Streamlit secrets:")
         lines.append("```")
@@ -132,101 +327,70 @@ def send_expiry_reminder(
 ) -> str:
     """
     Send an email reminder about documents and trials expiring soon.
-    Combines all urgent items into a single notification.
+    Combines all urgent items into a single notification, sent in the background.
     """
     repo = get_repository()
+    today = date.today()
     
-    # Get expiring documents
-    expiring_docs = repo.get_expiring_documents(days_ahead=days_ahead)
-    
-    # Get ending trials
-    trials = repo.get_free_trials()
-    ending_trials = []
-    for trial in trials:
-        if trial.trial_end_date:
-            days = (trial.trial_end_date - date.today()).days
-            if days <= days_ahead:
-                ending_trials.append((trial, days))
-    
-    # Get upcoming life events
-    events = repo.get_life_events(status="planning") + repo.get_life_events(status="in_progress")
-    upcoming_events = []
-    for event in events:
-        days = (event.target_date - date.today()).days
-        if 0 <= days <= days_ahead:
-            upcoming_events.append((event, days))
+    expiring_docs, ending_trials, upcoming_events = _cached_aggregate(
+        _cache_key(repo, "attention", today, days_ahead),
+        lambda: _collect_attention_items(repo, days_ahead)
+    )
     
     if not expiring_docs and not ending_trials and not upcoming_events:
         return f"✅ No items requiring attention in the next {days_ahead} days!"
     
+    counts = (
+        f"• {len(expiring_docs)} expiring document(s)\n"
+        f"• {len(ending_trials)} ending trial(s)\n"
+        f"• {len(upcoming_events)} upcoming event(s)"
+    )
+    
+    # Without credentials or a recipient the send would fail anyway, so
+    # report it now rather than from the background thread
+    config = _get_email_config()
+    if not _email_configured(config) or not (email or config["recipient_email"]):
+        if not _email_configured(config):
+            logger.warning("Email not configured. Set SENDER_EMAIL and SENDER_PASSWORD.")
+        else:
+            logger.warning("No recipient email configured.")
+        return (
+            f"⚠️ **Could not send email notification.**\n\n"
+            f"Items found:\n"
+            f"{counts}\n\n"
+            f"Please configure email settings. Use 'check notification status' for details."
+        )
+    
     # Build email content
     subject = f"🔔 Life Admin Alert: {len(expiring_docs) + len(ending_trials) + len(upcoming_events)} items need attention"
     
-    body = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-        <h2 style="color: #333;">🏠 Life Admin Assistant</h2>
-        <p>Here's your summary of items needing attention in the next {days_ahead} days:</p>
-    """
+    parts = [_HTML_PRELUDE_TMPL.format(days=days_ahead)]
     
     if expiring_docs:
-        body += """
-        <h3 style="color: #d63031;">📄 Expiring Documents</h3>
-        <ul>
-        """
-        for doc in expiring_docs:
-            days = doc.days_until_expiry()
-            urgency = "🔴" if days <= 7 else "🟠" if days <= 30 else "🟡"
-            body += f"<li>{urgency} <strong>{doc.name}</strong> - {days} days left</li>"
-        body += "</ul>"
+        parts.append(_DOCS_HEADER)
+        for name, days, _ in expiring_docs:
+            urgency = _URGENCY_EMOJIS[bisect_left(_URGENCY_THRESHOLDS, days)]
+            parts.append(f"<li>{urgency} <strong>{name}</strong> - {days} days left</li>")
+        parts.append("</ul>")
     
     if ending_trials:
-        body += """
-        <h3 style="color: #e17055;">💳 Free Trials Ending</h3>
-        <ul>
-        """
-        for trial, days in ending_trials:
-            body += f"<li>🆓 <strong>{trial.service_name}</strong> - {days} days left (${trial.cost}/{trial.billing_cycle} after)</li>"
-        body += "</ul>"
+        parts.append(_TRIALS_HEADER)
+        for service_name, days, (cost, billing_cycle) in ending_trials:
+            parts.append(f"<li>🆓 <strong>{service_name}</strong> - {days} days left (${cost}/{billing_cycle} after)</li>")
+        parts.append("</ul>")
     
     if upcoming_events:
-        body += """
-        <h3 style="color: #0984e3;">🎯 Upcoming Life Events</h3>
-        <ul>
-        """
-        for event, days in upcoming_events:
-            completed, total = event.get_progress()
-            pct = event.get_progress_percentage()
-            body += f"<li>📋 <strong>{event.title}</strong> - {days} days away ({pct:.0f}% complete)</li>"
-        body += "</ul>"
+        parts.append(_EVENTS_HEADER)
+        for title, days, pct in upcoming_events:
+            parts.append(f"<li>📋 <strong>{title}</strong> - {days} days away ({pct:.0f}% complete)</li>")
+        parts.append("</ul>")
     
-    body += """
-        <hr style="border: 1px solid #ddd;">
-        <p style="color: #666; font-size: 12px;">
-            Sent by Life Admin Assistant 🤖
-        </p>
-    </body>
-    </html>
-    """
+    parts.append(_HTML_FOOTER)
+    body = "".join(parts)
     
-    # Send email
-    if _send_email(subject, body, email):
-        return (
-            f"✅ **Reminder sent!**\n\n"
-            f"📧 Email sent with:\n"
-            f"• {len(expiring_docs)} expiring document(s)\n"
-            f"• {len(ending_trials)} ending trial(s)\n"
-            f"• {len(upcoming_events)} upcoming event(s)"
-        )
-    else:
-        return (
-            f"⚠️ **Could not send email notification.**\n\n"
-            f"Items found:\n"
-            f"• {len(expiring_docs)} expiring document(s)\n"
-            f"• {len(ending_trials)} ending trial(s)\n"
-            f"• {len(upcoming_events)} upcoming event(s)\n\n"
-            f"Please configure email settings. Use 'check notification status' for details."
-        )
+    # Send email in the background; failures are logged by _log_send_result
+    _queue_email(subject, body, email)
+    return f"✅ **Reminder queued!**\n\n📧 Email queued for sending with:\n{counts}"
 
 
 def send_test_notification(
@@ -269,26 +433,25 @@ def get_daily_digest() -> str:
     repo = get_repository()
     today = date.today()
     
+    urgent_docs, trials, upcoming_docs, events, summary = _cached_aggregate(
+        _cache_key(repo, "digest", today),
+        lambda: _collect_digest_data(repo, today)
+    )
+    
     lines = [f"📬 **Daily Digest** - {today.strftime('%B %d, %Y')}\n"]
     
     # Urgent items (next 7 days)
     lines.append("### 🚨 Urgent (Next 7 Days)")
     
-    urgent_docs = repo.get_expiring_documents(days_ahead=7)
     if urgent_docs:
-        for doc in urgent_docs:
-            days = doc.days_until_expiry()
+        for name, days in urgent_docs:
             if days < 0:
-                lines.append(f"• ⚠️ **{doc.name}** - EXPIRED {abs(days)} days ago!")
+                lines.append(f"• ⚠️ **{name}** - EXPIRED {abs(days)} days ago!")
             else:
-                lines.append(f"• 🔴 **{doc.name}** - {days} days left")
+                lines.append(f"• 🔴 **{name}** - {days} days left")
     
-    trials = repo.get_free_trials()
-    for trial in trials:
-        if trial.trial_end_date:
-            days = (trial.trial_end_date - today).days
-            if days <= 7:
-                lines.append(f"• 🆓 **{trial.service_name}** trial ends in {days} days")
+    for service_name, days in trials:
+        lines.append(f"• 🆓 **{service_name}** trial ends in {days} days")
     
     if len(lines) == 2:  # Only header, no urgent items
         lines.append("• ✅ No urgent items!")
@@ -296,17 +459,14 @@ def get_daily_digest() -> str:
     # Upcoming (8-30 days)
     lines.append("\n### 📅 Coming Up (8-30 Days)")
     
-    upcoming_docs = [d for d in repo.get_expiring_documents(days_ahead=30) 
-                     if 7 < d.days_until_expiry() <= 30]
-    for doc in upcoming_docs:
-        lines.append(f"• 🟠 **{doc.name}** - {doc.days_until_expiry()} days")
+    for name, days in upcoming_docs:
+        lines.append(f"• 🟠 **{name}** - {days} days")
     
     if not upcoming_docs:
         lines.append("• ✅ Nothing in this period")
     
     # Active life events
     lines.append("\n### 🎯 Active Life Events")
-    events = repo.get_life_events(status="planning") + repo.get_life_events(status="in_progress")
     
     if events:
         for event in events[:5]:
@@ -318,7 +478,6 @@ def get_daily_digest() -> str:
         lines.append("• No active events")
     
     # Spending summary
-    summary = repo.get_spending_summary()
     lines.append(f"\n### 💰 Monthly Spending: ${summary['monthly_total']:.2f}")
     
     return "\n".join(lines)
@@ -328,9 +487,9 @@ def get_daily_digest() -> str:
 # EXPORT
 # ============================================================
 
-NOTIFICATION_TOOLS = [
+NOTIFICATION_TOOLS = (
     check_notification_status,
     send_expiry_reminder,
     send_test_notification,
     get_daily_digest,
-]
+)
@@ -4,6 +4,7 @@ Track recurring payments, free trials, and calculate spending.
 """
 
 from datetime import date, datetime
+from functools import lru_cache
 from typing import Annotated, Optional
 
 from ..database.repository.repository import Repository
@@ -28,6 +29,19 @@ def set_repository(repo: Repository):
     _repository = repo
 
 
+_VALID_CYCLES = frozenset(("weekly", "monthly", "yearly"))
+_VALID_CATEGORIES = frozenset((
+    "streaming", "software", "fitness", "gaming",
+    "news", "storage", "education", "utilities", "other"
+))
+
+
+@lru_cache(maxsize=2048)
+def _parse_iso_date(value: str) -> date:
+    """Parse a YYYY-MM-DD string; dates are immutable, so results are shared."""
+    return date.fromisoformat(value)
+
+
 # ============================================================
 # TOOL FUNCTIONS
 # ============================================================
@@ -47,28 +61,25 @@ def add_subscription(
     Helps monitor spending and avoid surprise charges.
     """
     try:
-        renewal = date.fromisoformat(renewal_date)
-        trial_end = date.fromisoformat(trial_end_date) if trial_end_date else None
+        renewal = _parse_iso_date(renewal_date)
+        trial_end = _parse_iso_date(trial_end_date) if trial_end_date else None
         
         # Validate billing cycle
-        valid_cycles = ["weekly", "monthly", "yearly"]
-        if billing_cycle.lower() not in valid_cycles:
+        billing_cycle = billing_cycle.lower()
+        if billing_cycle not in _VALID_CYCLES:
             billing_cycle = "monthly"
         
         # Validate category
-        valid_categories = [
-            "streaming", "software", "fitness", "gaming", 
-            "news", "storage", "education", "utilities", "other"
-        ]
-        if category.lower() not in valid_categories:
+        category = category.lower()
+        if category not in _VALID_CATEGORIES:
             category = "other"
         
         subscription = Subscription(
             service_name=service_name,
             cost=cost,
             renewal_date=renewal,
-            billing_cycle=billing_cycle.lower(),
-            category=category.lower(),
+            billing_cycle=billing_cycle,
+            category=category,
             is_free_trial=is_free_trial,
             trial_end_date=trial_end,
             notes=notes
@@ -118,27 +129,26 @@ def list_subscriptions(
         if not subscriptions:
             return "📭 No subscriptions found. Add some to start tracking your spending!"
         
-        lines = [f"💳 **Your Subscriptions** ({len(subscriptions)} total)\n"]
-        
-        total_monthly = 0
-        trials = []
-        
-        for sub in subscriptions:
-            if sub.is_free_trial:
-                trials.append(sub)
-                lines.append(f"• 🆓 {sub.service_name} - FREE TRIAL")
-                if sub.trial_end_date:
-                    days = (sub.trial_end_date - date.today()).days
-                    lines.append(f"     Trial ends in {days} days (${sub.cost}/{sub.billing_cycle} after)")
-            else:
-                monthly = sub.get_monthly_cost()
-                total_monthly += monthly
-                lines.append(f"• {sub.service_name} ({sub.category}) - ${sub.cost}/{sub.billing_cycle}")
+        today = date.today()
+        trial_count = sum(1 for sub in subscriptions if sub.is_free_trial)
+        total_monthly = sum(sub.monthly_cost for sub in subscriptions if not sub.is_free_trial)
         
+        lines = [f"💳 **Your Subscriptions** ({len(subscriptions)} total)\n"]
+        lines += [
+            (
+                f"• 🆓 {sub.service_name} - FREE TRIAL\n"
+                f"     Trial ends in {(sub.trial_end_date - today).days} days (${sub.cost}/{sub.billing_cycle} after)"
+                if sub.trial_end_date else
+                f"• 🆓 {sub.service_name} - FREE TRIAL"
+            )
+            if sub.is_free_trial else
+            f"• {sub.service_name} ({sub.category}) - ${sub.cost}/{sub.billing_cycle}"
+            for sub in subscriptions
+        ]
         lines.append(f"\n💰 **Total: ${total_monthly:.2f}/month** (${total_monthly * 12:.2f}/year)")
         
-        if trials:
-            lines.append(f"⚠️ {len(trials)} free trial(s) to watch!")
+        if trial_count:
+            lines.append(f"⚠️ {trial_count} free trial(s) to watch!")
         
         return "\n".join(lines)
         
@@ -200,34 +210,29 @@ def get_trial_alerts(
         if not trials:
             return "✅ No active free trials to monitor."
         
-        ending_soon = []
-        active = []
-        
+        today = date.today()
+        ending_soon, active = [], []
+        # Trials come ordered by trial end date, so both buckets fill in sorted order
         for trial in trials:
             if trial.trial_end_date:
-                days = (trial.trial_end_date - date.today()).days
-                if days <= days_ahead:
-                    ending_soon.append((trial, days))
-                else:
-                    active.append((trial, days))
+                days = (trial.trial_end_date - today).days
+                (ending_soon if days <= days_ahead else active).append((trial, days))
         
         lines = [f"🆓 **Free Trial Status**\n"]
         
         if ending_soon:
             lines.append("🚨 **ENDING SOON:**")
-            for trial, days in sorted(ending_soon, key=lambda x: x[1]):
-                if days < 0:
-                    lines.append(f"  ⚠️ {trial.service_name} - ENDED {abs(days)} days ago!")
-                elif days == 0:
-                    lines.append(f"  🔴 {trial.service_name} - ENDS TODAY! (${trial.cost}/{trial.billing_cycle})")
-                else:
-                    lines.append(f"  🟠 {trial.service_name} - {days} days left (${trial.cost}/{trial.billing_cycle} after)")
+            lines += [
+                f"  ⚠️ {trial.service_name} - ENDED {abs(days)} days ago!" if days < 0 else
+                f"  🔴 {trial.service_name} - ENDS TODAY! (${trial.cost}/{trial.billing_cycle})" if days == 0 else
+                f"  🟠 {trial.service_name} - {days} days left (${trial.cost}/{trial.billing_cycle} after)"
+                for trial, days in ending_soon
+            ]
             lines.append("")
         
         if active:
             lines.append("✅ **Active Trials:**")
-            for trial, days in active:
-                lines.append(f"  🟢 {trial.service_name} - {days} days remaining")
+            lines += [f"  🟢 {trial.service_name} - {days} days remaining" for trial, days in active]
         
         if not ending_soon and not active:
             return "✅ No free trials currently active."
@@ -246,15 +251,13 @@ def delete_subscription(
     """
     try:
         repo = get_repository()
-        subscriptions = repo.get_subscriptions(active_only=False)
         
         # Find by name (case-insensitive)
-        matching = [s for s in subscriptions if s.service_name.lower() == service_name.lower()]
+        sub = repo.find_subscription_by_name(service_name)
         
-        if not matching:
+        if sub is None:
             return f"❌ Subscription '{service_name}' not found."
         
-        sub = matching[0]
         repo.delete_subscription(sub.id)
         
         return f"✅ Removed '{sub.service_name}' from tracking."
@@ -267,10 +270,10 @@ def delete_subscription(
 # EXPORT
 # ============================================================
 
-SUBSCRIPTION_TOOLS = [
+SUBSCRIPTION_TOOLS = (
     add_subscription,
     list_subscriptions,
     get_spending_summary,
     get_trial_alerts,
     delete_subscription
-]
\ No newline at end of file
+)
\ No newline at end of file
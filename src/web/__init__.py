@@ -2,7 +2,7 @@
 
 from .styles import apply_custom_styles
 from .sidebar import render_sidebar
-from .chat import render_chat, render_welcome_message
+from .chat import render_chat, render_welcome_message, new_message_history
 from .overview import render_overview_tab
 
 __all__ = [
@@ -10,5 +10,6 @@ __all__ = [
     "render_sidebar", 
     "render_chat",
     "render_welcome_message",
+    "new_message_history",
     "render_overview_tab"
 ]
@@ -2,31 +2,98 @@
 
 import streamlit as st
 import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
+
+
+# scrypt cost parameters for new password hashes; they are stored with each
+# hash, so raising them later doesn't invalidate existing accounts
+_SCRYPT_N = 2 ** 14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SCRYPT_PREFIX = "scrypt$"
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with a random salt using scrypt."""
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(
+        password.encode(), salt=salt, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P, dklen=32
+    )
+    return f"{_SCRYPT_PREFIX}{_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, stored_hash: str) -> Tuple[bool, bool]:
+    """
+    Check a password against a stored hash.
+    Returns (matches, needs_rehash); needs_rehash is True for legacy
+    unsalted SHA-256 hashes so they can be upgraded on login.
+    """
+    if not stored_hash.startswith(_SCRYPT_PREFIX):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored_hash), True
+    
+    n, r, p, salt, digest = stored_hash[len(_SCRYPT_PREFIX):].split("$")
+    candidate = hashlib.scrypt(
+        password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p), dklen=32
+    )
+    return hmac.compare_digest(candidate.hex(), digest), False
+
+
+# (database path, table) pairs already created in this process, so the auth
+# helpers below don't re-run CREATE TABLE on every call
+_initialized_tables: set = set()
 
 
 def init_sessions_table(repo):
-    """Initialize the sessions table in the database."""
+    """
+    Initialize the sessions table in the database (once per database file).
+    Sessions carry a copy of the user's username and display name so a
+    token resolves without joining users.
+    """
+    key = (repo.db_key, "sessions")
+    if key in _initialized_tables:
+        return
+    init_users_table(repo)
     with repo._get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS sessions (
             token TEXT PRIMARY KEY,
             user_id TEXT NOT NULL,
+            username TEXT,
+            display_name TEXT,
             created_at TEXT
         )
         """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions(user_id)")
+        
+        # Migration: copy user details into sessions created before they were stored there
+        cursor.execute("PRAGMA table_info(sessions)")
+        columns = [col[1] for col in cursor.fetchall()]
+        if "username" not in columns:
+            cursor.execute("ALTER TABLE sessions ADD COLUMN username TEXT")
+            cursor.execute("ALTER TABLE sessions ADD COLUMN display_name TEXT")
+            cursor.execute("""
+            UPDATE sessions SET
+                username = (SELECT u.username FROM users u WHERE u.id = sessions.user_id),
+                display_name = (SELECT u.display_name FROM users u WHERE u.id = sessions.user_id)
+            """)
+            cursor.execute("DELETE FROM sessions WHERE username IS NULL")
+    _initialized_tables.add(key)
 
 
 def init_users_table(repo):
-    """Initialize the users table in the database."""
+    """Initialize the users table in the database (once per database file)."""
+    key = (repo.db_key, "users")
+    if key in _initialized_tables:
+        return
     with repo._get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
@@ -38,6 +105,7 @@ def init_users_table(repo):
             created_at TEXT
         )
         """)
+    _initialized_tables.add(key)
 
 
 def create_user(repo, username: str, password: str, display_name: str = None) -> Tuple[bool, str]:
@@ -47,15 +115,12 @@ def create_user(repo, username: str, password: str, display_name: str = None) ->
     with repo._get_connection() as conn:
         cursor = conn.cursor()
         
-        # Check if username exists
-        cursor.execute("SELECT id FROM users WHERE username = ?", (username.lower(),))
-        if cursor.fetchone():
-            return False, "Username already exists"
-        
+        # Insert unless the username is taken; one statement does both
         user_id = str(uuid.uuid4())
         cursor.execute("""
         INSERT INTO users (id, username, password_hash, display_name, created_at)
         VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(username) DO NOTHING
         """, (
             user_id,
             username.lower(),
@@ -64,6 +129,8 @@ def create_user(repo, username: str, password: str, display_name: str = None) ->
             datetime.now().isoformat()
         ))
         
+        if cursor.rowcount == 0:
+            return False, "Username already exists"
         return True, user_id
 
 
@@ -74,61 +141,107 @@ def authenticate_user(repo, username: str, password: str) -> Tuple[bool, Optiona
     with repo._get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-        SELECT id, username, display_name FROM users 
-        WHERE username = ? AND password_hash = ?
-        """, (username.lower(), hash_password(password)))
+        SELECT id, username, display_name, password_hash FROM users 
+        WHERE username = ?
+        """, (username.lower(),))
         
         row = cursor.fetchone()
         if row:
+            user_id, username, display_name, password_hash = row
+            matches, needs_rehash = verify_password(password, password_hash)
+            if not matches:
+                return False, None
+            if needs_rehash:
+                cursor.execute(
+                    "UPDATE users SET password_hash = ? WHERE id = ?",
+                    (hash_password(password), user_id)
+                )
             return True, {
-                "id": row["id"],
-                "username": row["username"],
-                "display_name": row["display_name"]
+                "id": user_id,
+                "username": username,
+                "display_name": display_name
             }
         return False, None
 
 
-def create_session(repo, user_id: str) -> str:
-    """Create a session token for a user."""
+def create_session(repo, user: dict) -> str:
+    """Create a session token for a user (as returned by authenticate_user)."""
     init_sessions_table(repo)
     token = str(uuid.uuid4())
     
     with repo._get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-        INSERT INTO sessions (token, user_id, created_at)
-        VALUES (?, ?, ?)
-        """, (token, user_id, datetime.now().isoformat()))
+        INSERT INTO sessions (token, user_id, username, display_name, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        """, (token, user["id"], user["username"], user["display_name"], datetime.now().isoformat()))
     
     return token
 
 
+# Resolved session tokens, so a Streamlit rerun doesn't hit the database
+# just to re-identify the user; delete_session drops the entry.
+_SESSION_CACHE_TTL_SECONDS = 60
+_SESSION_CACHE_MAX_ENTRIES = 256
+_session_cache: Dict[tuple, Tuple[float, dict]] = {}
+# Shared by every session thread; guards lookups, evictions and stores
+_session_cache_lock = threading.Lock()
+
+
 def get_user_by_session(repo, token: str) -> Optional[dict]:
     """Get user info from session token."""
-    init_users_table(repo)
+    key = (repo.db_key, token)
+    now = time.monotonic()
+    with _session_cache_lock:
+        hit = _session_cache.get(key)
+    if hit is not None and hit[0] > now:
+        return dict(hit[1])
+    
+    user = _resolve_session(repo, token)
+    with _session_cache_lock:
+        if user is None:
+            _session_cache.pop(key, None)
+            return None
+        if key not in _session_cache and len(_session_cache) >= _SESSION_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            del _session_cache[next(iter(_session_cache))]
+        _session_cache[key] = (now + _SESSION_CACHE_TTL_SECONDS, user)
+    return dict(user)
+
+
+# One long-lived read-only connection per database file for session lookups,
+# shared across Streamlit's threads under _read_lock
+_read_connections: Dict[str, sqlite3.Connection] = {}
+_read_lock = threading.Lock()
+
+
+def _resolve_session(repo, token: str) -> Optional[dict]:
+    """Look up the user owning a session token in the database."""
     init_sessions_table(repo)
     
-    with repo._get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-        SELECT u.id, u.username, u.display_name 
-        FROM users u
-        JOIN sessions s ON u.id = s.user_id
-        WHERE s.token = ?
-        """, (token,))
+    with _read_lock:
+        conn = _read_connections.get(repo.db_key)
+        if conn is None:
+            conn = _read_connections[repo.db_key] = repo._connect(check_same_thread=False)
+        row = conn.execute("""
+        SELECT user_id, username, display_name FROM sessions
+        WHERE token = ?
+        """, (token,)).fetchone()
         
-        row = cursor.fetchone()
         if row:
+            user_id, username, display_name = row
             return {
-                "id": row["id"],
-                "username": row["username"],
-                "display_name": row["display_name"]
+                "id": user_id,
+                "username": username,
+                "display_name": display_name
             }
         return None
 
 
 def delete_session(repo, token: str):
     """Delete a session token."""
+    with _session_cache_lock:
+        _session_cache.pop((repo.db_key, token), None)
     init_sessions_table(repo)
     with repo._get_connection() as conn:
         cursor = conn.cursor()
@@ -171,7 +284,7 @@ def render_auth_page():
                         success, user = authenticate_user(st.session_state.repo, username, password)
                         if success:
                             # Create session and store in URL
-                            token = create_session(st.session_state.repo, user["id"])
+                            token = create_session(st.session_state.repo, user)
                             st.session_state.user = user
                             st.session_state.session_token = token
                             st.query_params["session"] = token
@@ -210,7 +323,7 @@ def render_auth_page():
                                 "username": new_username.lower(),
                                 "display_name": new_display or new_username
                             }
-                            token = create_session(st.session_state.repo, result)
+                            token = create_session(st.session_state.repo, user)
                             st.session_state.user = user
                             st.session_state.session_token = token
                             st.query_params["session"] = token
@@ -236,6 +349,6 @@ def logout():
     if "user" in st.session_state:
         del st.session_state.user
     if "messages" in st.session_state:
-        st.session_state.messages = []
+        st.session_state.messages.clear()
     if "agent" in st.session_state:
         st.session_state.agent.reset_conversation()
@@ -0,0 +1,56 @@
+"""Cached dashboard data shared by the sidebar and overview tab."""
+
+import streamlit as st
+import threading
+from datetime import date
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+from ..database.repository.repository import OverviewBundle, Repository, SidebarSnapshot
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def _load_bundle(db_key: str, user_id: str, data_version: int, today: date, _repo) -> OverviewBundle:
+    """
+    Dashboard data for one user, recomputed only when the repository's data
+    version (bumped on every write) or the date changes. _repo is excluded
+    from the cache key; the TTL bounds staleness from other processes.
+    """
+    return _repo.get_overview_bundle(days_ahead=30)
+
+
+def load_dashboard(repo) -> OverviewBundle:
+    """Documents, subscriptions, events and summaries for the current user."""
+    return _load_bundle(repo.db_key, repo.user_id, repo.data_version, date.today(), repo)
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def _load_snapshot(db_key: str, user_id: str, data_version: int, today: date, _repo) -> SidebarSnapshot:
+    """Sidebar aggregates, keyed the same way as _load_bundle."""
+    return _repo.get_sidebar_snapshot(days_ahead=30)
+
+
+def load_sidebar_snapshot(repo) -> SidebarSnapshot:
+    """Counts and short previews for the sidebar dashboard."""
+    return _load_snapshot(repo.db_key, repo.user_id, repo.data_version, date.today(), repo)
+
+
+def prewarm_dashboard(repo) -> threading.Thread:
+    """
+    Fill the sidebar and overview caches on a background thread, so the
+    reads overlap other login work instead of blocking the first render.
+    The thread queries through its own Repository pinned to the current
+    user, so a later set_user() on repo cannot mix users under one key.
+    """
+    db_path, user_id = repo.db_path, repo.user_id
+    key = (repo.db_key, user_id, repo.data_version, date.today())
+
+    def _warm():
+        own_repo = Repository(db_path=db_path, user_id=user_id)
+        _load_snapshot(*key, own_repo)
+        _load_bundle(*key, own_repo)
+
+    thread = threading.Thread(target=_warm, name="dashboard-prewarm", daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return thread
@@ -2,25 +2,41 @@
 
 import streamlit as st
 import asyncio
+import threading
+from collections import deque
+from typing import Iterable
 
 from .overview import render_overview_tab
 
+# Older messages fall off the front so long sessions stay bounded
+MAX_CHAT_MESSAGES = 200
+
+
+def new_message_history(messages: Iterable[dict] = ()) -> deque:
+    """Create the bounded chat history kept in st.session_state.messages."""
+    return deque(messages, maxlen=MAX_CHAT_MESSAGES)
+
+
+# One long-lived event loop on a background thread. Async clients held by
+# the (shared) agent stay bound to it, so their connection pools survive
+# between chat turns instead of being torn down with a per-call loop.
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the shared event loop thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="chat-async", daemon=True).start()
+    return _loop
+
 
 def run_async(coro):
     """Run async coroutine in sync context."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If there's already a running loop, create a new one in a thread
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
-                return future.result()
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        # No event loop exists, create a new one
-        return asyncio.run(coro)
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
 
 
 def render_welcome_message():
@@ -86,6 +102,7 @@ def render_chat():
         
         # If last message is from user, get agent response
         if has_messages and st.session_state.messages[-1]["role"] == "user":
+            data_version = st.session_state.repo.data_version
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
                     try:
@@ -94,12 +111,16 @@ def render_chat():
                         ))
                     except Exception as e:
                         response = f"Error: {str(e)}"
+                st.markdown(response)
             
             st.session_state.messages.append({
                 "role": "assistant",
                 "content": response
             })
-            st.rerun()
+            # The reply is already on screen; only rerun when a tool wrote
+            # data, so the sidebar dashboard picks up the change
+            if st.session_state.repo.data_version != data_version:
+                st.rerun()
         
         # Chat input - always at bottom
         if prompt := st.chat_input("Ask me about your documents, subscriptions, or life events..."):
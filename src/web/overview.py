@@ -1,21 +1,24 @@
 """Overview tab component for the web UI."""
 
 import streamlit as st
+from collections import defaultdict
 from datetime import date
 
+from .cache import load_dashboard
+
 
 def render_overview_tab():
     """Render the overview/analytics tab."""
     st.markdown("## Your Life Admin Overview")
+    today = date.today()
     
     # Top row - key metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    docs = st.session_state.repo.get_documents()
-    subs = st.session_state.repo.get_subscriptions()
-    events = st.session_state.repo.get_life_events()
-    summary = st.session_state.repo.get_spending_summary()
-    expiring = st.session_state.repo.get_expiring_documents(days_ahead=30)
+    bundle = load_dashboard(st.session_state.repo)
+    docs, subs, events = bundle.docs, bundle.subs, bundle.events
+    summary = bundle.spending_summary
+    expiring = bundle.expiring
     
     with col1:
         st.metric("Documents", len(docs), delta=f"{len(expiring)} expiring" if expiring else None, delta_color="inverse")
@@ -36,8 +39,9 @@ def render_overview_tab():
         # Documents section
         st.markdown("### Documents")
         if docs:
-            for doc in sorted(docs, key=lambda d: d.expiry_date)[:5]:
-                days = doc.days_until_expiry()
+            # The repository returns documents ordered by expiry date
+            for doc in docs[:5]:
+                days = (doc.expiry_date - today).days
                 if days < 0:
                     status = ":material/error: EXPIRED"
                 elif days <= 7:
@@ -59,19 +63,16 @@ def render_overview_tab():
         st.markdown("### Life Events")
         if events:
             for event in events:
-                completed, total = event.get_progress()
-                pct = event.get_progress_percentage()
-                days_left = (event.target_date - date.today()).days
+                completed, total, pct = event.progress_summary()
+                days_left = (event.target_date - today).days
                 
                 with st.expander(f"**{event.title}** - {completed}/{total} tasks ({days_left}d left)", expanded=False):
                     st.progress(pct / 100)
                     
                     # Group tasks by category
-                    tasks_by_category = {}
+                    tasks_by_category = defaultdict(list)
                     for item in event.checklist_items:
                         cat = (item.category or "general").replace("_", " ").title()
-                        if cat not in tasks_by_category:
-                            tasks_by_category[cat] = []
                         tasks_by_category[cat].append(item)
                     
                     for category, items in tasks_by_category.items():
@@ -89,32 +90,25 @@ def render_overview_tab():
         # Subscriptions section
         st.markdown("### Subscriptions")
         if subs:
-            # Group by category
-            categories = {}
-            for sub in subs:
-                cat = sub.category.title()
-                if cat not in categories:
-                    categories[cat] = {"count": 0, "total": 0}
-                categories[cat]["count"] += 1
-                categories[cat]["total"] += sub.get_monthly_cost()
-            
-            for cat, data in sorted(categories.items(), key=lambda x: x[1]["total"], reverse=True):
-                st.markdown(f"**{cat}**: {data['count']} sub(s) - ${data['total']:.2f}/mo")
+            # Grouped by category in the bundle, highest monthly cost first
+            for cat, (count, total) in bundle.by_category.items():
+                st.markdown(f"**{cat.title()}**: {count} sub(s) - ${total:.2f}/mo")
             
             st.divider()
             st.markdown(f"**Total:** ${summary['monthly_total']:.2f}/month")
             st.markdown(f"**Yearly:** ${summary['yearly_total']:.2f}/year")
             
             # Free trials
-            trials = [s for s in subs if s.is_free_trial]
+            trials = [
+                (s.service_name, (s.trial_end_date - today).days)
+                for s in subs if s.is_free_trial and s.trial_end_date
+            ]
             if trials:
                 st.markdown("#### Free Trials")
-                for trial in trials:
-                    if trial.trial_end_date:
-                        days = (trial.trial_end_date - date.today()).days
-                        if days <= 3:
-                            st.error(f"{trial.service_name}: {days}d left!")
-                        else:
-                            st.warning(f"{trial.service_name}: {days}d left")
+                for service_name, days in trials:
+                    if days <= 3:
+                        st.error(f"{service_name}: {days}d left!")
+                    else:
+                        st.warning(f"{service_name}: {days}d left")
         else:
             st.info("No subscriptions tracked. Try: 'I subscribe to Netflix for $15.99/month'")
@@ -2,7 +2,22 @@
 
 import streamlit as st
 from datetime import date
+from functools import lru_cache
 from .auth import get_current_user, logout
+from .cache import load_sidebar_snapshot
+
+# (button label, message sent to the agent)
+_QUICK_ACTIONS = (
+    (":material/description: Add Document", "I want to add a new document"),
+    (":material/credit_card: Add Subscription", "I want to add a new subscription"),
+    (":material/event: Start Life Event", "What life events can you help me with?"),
+)
+
+
+@lru_cache(maxsize=1)
+def _today_caption(today: date) -> str:
+    """Footer date line, formatted once per day."""
+    return f"Today: {today.strftime('%B %d, %Y')}"
 
 
 def render_sidebar():
@@ -27,83 +42,70 @@ def render_sidebar():
         # Quick Actions
         st.markdown("**:material/bolt: Quick Actions**")
         
-        if st.button(":material/description: Add Document", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "I want to add a new document"})
-            st.rerun()
-        
-        if st.button(":material/credit_card: Add Subscription", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "I want to add a new subscription"})
-            st.rerun()
-        
-        if st.button(":material/event: Start Life Event", use_container_width=True):
-            st.session_state.messages.append({"role": "user", "content": "What life events can you help me with?"})
-            st.rerun()
+        for label, prompt in _QUICK_ACTIONS:
+            if st.button(label, use_container_width=True):
+                st.session_state.messages.append({"role": "user", "content": prompt})
+                st.rerun()
         
         st.divider()
         
-        # Dashboard
-        st.markdown("**:material/dashboard: Dashboard**")
-        
-        # Document Summary
-        with st.expander(":material/description: Documents", expanded=True):
-            docs = st.session_state.repo.get_documents()
-            expiring = st.session_state.repo.get_expiring_documents(days_ahead=30)
-            
-            col1, col2 = st.columns(2)
-            col1.metric("Total", len(docs))
-            col2.metric("Expiring", len(expiring))
-            
-            if expiring:
-                st.markdown("---")
-                for doc in expiring[:3]:
-                    days = doc.days_until_expiry()
-                    if days < 0:
-                        st.caption(f"⚠️ **{doc.name}** — Expired")
-                    elif days <= 7:
-                        st.caption(f"⚠️ **{doc.name}** — {days} days left")
-                    else:
-                        st.caption(f"• {doc.name} — {days} days left")
-
-        # Subscription Summary
-        with st.expander(":material/credit_card: Subscriptions", expanded=True):
-            subs = st.session_state.repo.get_subscriptions()
-            summary = st.session_state.repo.get_spending_summary()
-            
-            col1, col2 = st.columns(2)
-            col1.metric("Monthly", f"${summary['monthly_total']:.0f}")
-            col2.metric("Yearly", f"${summary['yearly_total']:.0f}")
-            
-            # Trials ending soon
-            trials = [s for s in subs if s.is_free_trial]
-            ending_trials = [s for s in trials if s.trial_end_date and (s.trial_end_date - date.today()).days <= 7]
-            
-            if ending_trials:
-                st.markdown("---")
-                st.caption("**Trials ending soon:**")
-                for trial in ending_trials[:2]:
-                    days = (trial.trial_end_date - date.today()).days
-                    st.caption(f"⚠️ {trial.service_name} — {days} days left")
-
-        # Life Events Summary  
-        with st.expander(":material/event: Life Events", expanded=True):
-            events = st.session_state.repo.get_life_events()
-            active_events = [e for e in events if e.status != "completed"]
-            total_tasks = sum(len(e.checklist_items) for e in active_events)
-            completed_tasks = sum(sum(1 for i in e.checklist_items if i.is_completed) for e in active_events)
-            
-            col1, col2 = st.columns(2)
-            col1.metric("Active", len(active_events))
-            col2.metric("Tasks", f"{completed_tasks}/{total_tasks}")
-            
-            st.caption("👉 See **Overview tab** for checklists")
+        _render_dashboard()
         
         st.divider()
         
         # Footer actions
         if st.button(":material/refresh: Clear conversation", use_container_width=True):
-            st.session_state.messages = []
+            st.session_state.messages.clear()
             if hasattr(st.session_state, 'agent'):
                 st.session_state.agent.reset_conversation()
             st.rerun()
         
-        st.caption(f"Today: {date.today().strftime('%B %d, %Y')}")
+        st.caption(_today_caption(date.today()))
+
+
+@st.fragment(run_every="60s")
+def _render_dashboard():
+    """
+    Dashboard summaries. As a fragment it refreshes itself every minute
+    (picking up writes from agent tools) without rerunning the whole app.
+    """
+    # Dashboard
+    st.markdown("**:material/dashboard: Dashboard**")
+    snapshot = load_sidebar_snapshot(st.session_state.repo)
+    
+    # Document Summary
+    with st.expander(":material/description: Documents", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Total", snapshot.total_docs)
+        col2.metric("Expiring", snapshot.expiring_count)
+        
+        if snapshot.expiring_preview:
+            st.markdown("---")
+            for name, days in snapshot.expiring_preview:
+                if days < 0:
+                    st.caption(f"⚠️ **{name}** — Expired")
+                elif days <= 7:
+                    st.caption(f"⚠️ **{name}** — {days} days left")
+                else:
+                    st.caption(f"• {name} — {days} days left")
+
+    # Subscription Summary
+    with st.expander(":material/credit_card: Subscriptions", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Monthly", f"${snapshot.monthly_total:.0f}")
+        col2.metric("Yearly", f"${snapshot.yearly_total:.0f}")
+        
+        # Trials ending soon
+        if snapshot.ending_trials:
+            st.markdown("---")
+            st.caption("**Trials ending soon:**")
+            for service_name, days in snapshot.ending_trials:
+                st.caption(f"⚠️ {service_name} — {days} days left")
+
+    # Life Events Summary  
+    with st.expander(":material/event: Life Events", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Active", snapshot.active_events)
+        col2.metric("Tasks", f"{snapshot.completed_tasks}/{snapshot.total_tasks}")
+        
+        st.caption("👉 See **Overview tab** for checklists")
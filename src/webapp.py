@@ -7,20 +7,22 @@ organized in the src/web/ package for better maintainability.
 """
 
 import streamlit as st
+from collections import deque
 from pathlib import Path
 import sys
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.agent import LifeAdminAgent
+from src.agent import LifeAdminAgent, create_shared_clients
 from src.database.repository.repository import Repository
 
 # Import UI components
 from src.web.styles import apply_custom_styles
 from src.web.sidebar import render_sidebar
-from src.web.chat import render_chat
+from src.web.chat import render_chat, new_message_history
 from src.web.auth import render_auth_page, get_current_user, logout, init_sessions_table
+from src.web.cache import prewarm_dashboard
 
 
 # Page configuration (must be first Streamlit command)
@@ -41,8 +43,15 @@ if "repo" not in st.session_state or not hasattr(st.session_state.repo, "set_use
     init_sessions_table(st.session_state.repo)  # Ensure sessions table exists
 
 # Initialize session state for persistence across reruns
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+# (sessions from older versions may still hold a plain list)
+if not isinstance(st.session_state.get("messages"), deque):
+    st.session_state.messages = new_message_history(st.session_state.get("messages", ()))
+
+
+@st.cache_resource(show_spinner=False)
+def _get_shared_clients():
+    """Model clients and memory store, built once per process and shared by every session's agent."""
+    return create_shared_clients()
 
 
 def init_user_session(user: dict):
@@ -52,10 +61,12 @@ def init_user_session(user: dict):
     
     # Create agent if not exists or user changed
     if "agent" not in st.session_state or st.session_state.get("current_user_id") != user["id"]:
-        st.session_state.agent = LifeAdminAgent()
+        # Dashboard reads run while the agent (and its memory context) loads
+        prewarm_dashboard(st.session_state.repo)
+        st.session_state.agent = LifeAdminAgent(clients=_get_shared_clients())
         st.session_state.agent.set_user(user["id"])
         st.session_state.current_user_id = user["id"]
-        st.session_state.messages = []
+        st.session_state.messages = new_message_history()
     else:
         # Ensure user is set even on page refresh
         st.session_state.agent.set_user(user["id"])